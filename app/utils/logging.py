@@ -44,10 +44,12 @@ def setup_logger(app_name: str, debug_level: LOG_LEVELS = 'DEBUG') -> logging.Lo
     logger = logging.getLogger(app_name)
     logger.setLevel(logging.DEBUG)
 
-    handler = logging.StreamHandler()
-    formatter = ColorfulFormatter(app_name)
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    # NOTE Only configure each logger once, otherwise every call duplicates the log lines
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        formatter = ColorfulFormatter(app_name)
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
 
     if debug_level in LEVELS:
         logger.setLevel(LEVELS[debug_level])
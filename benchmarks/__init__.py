@@ -0,0 +1,3 @@
+from .runner import benchmark, discover
+
+__all__ = ['benchmark', 'discover']
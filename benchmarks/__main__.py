@@ -0,0 +1,86 @@
+"""
+Runs the fastcore benchmarks, and compares them with the stored baseline.
+
+Usage:
+    python -m benchmarks
+    python -m benchmarks -k repository -k hydration --output results.json
+    python -m benchmarks --save-baseline
+"""
+import argparse
+import json
+import os
+import sys
+import warnings
+
+from fastcore.logger import configure_levels
+
+from .runner import compare, discover, format_time, metadata, run_all, run_sync
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmarks of the fastcore hot paths.')
+    parser.add_argument('-k', '--filter', action='append', default=[], help='Only run the benchmarks containing this text.')
+    parser.add_argument('--output', help='Write the results as JSON to this file, or - for stdout.')
+    parser.add_argument('--baseline', default=BASELINE, help='The baseline to compare with.')
+    parser.add_argument('--threshold', type=float, default=float(os.getenv('BENCH_THRESHOLD', 0.25)),
+                        help='Slowdown, as a fraction of the baseline, reported as a regression. Defaults to 0.25.')
+    parser.add_argument('--save-baseline', action='store_true', help='Store the results as the new baseline.')
+    parser.add_argument('--scale', type=float, default=1.0, help='Scale the operations per round, e.g. 0.1 for a quick run.')
+    parser.add_argument('--list', action='store_true', help='List the benchmarks and exit.')
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    # NOTE Benchmarks measure the code, not the console
+    configure_levels({'': 'WARNING'})
+    # NOTE The default `SECRET_KEY` is short, the warning would be repeated on every token
+    warnings.filterwarnings('ignore', message='The HMAC key')
+
+    benchmarks = [bench for name, bench in sorted(discover().items())
+                  if not args.filter or any(text in name for text in args.filter)]
+    if args.list:
+        for bench in benchmarks:
+            print(bench.name)
+        return 0
+
+    log = sys.stderr if args.output == '-' else sys.stdout
+
+    def progress(result):
+        allocated = f'{result.peak_bytes_per_op / 1024:>10,.1f} KiB peak' if result.peak_bytes_per_op is not None else ''
+        transferred = f'{result.bytes_per_op:>12,.0f} B/op' if result.bytes_per_op else ''
+        print(f'{result.name:<50} {format_time(result.median):>10} {result.items_per_sec:>14,.0f} items/s'
+              f'{allocated}{transferred}', file=log)
+
+    results = run_sync(run_all(benchmarks, args.scale, progress))
+    report = {'meta': metadata(), 'results': {name: result.model_dump() for name, result in results.items()}}
+
+    comparisons = []
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        comparisons = compare(results, baseline, args.threshold)
+        report['comparison'] = {'baseline': args.baseline, 'threshold': args.threshold,
+                                'results': [comparison.model_dump() for comparison in comparisons]}
+        print(f'\nCompared with {args.baseline} (threshold {args.threshold:.0%}):', file=log)
+        for comparison in comparisons:
+            flag = 'REGRESSION' if comparison.regression else ''
+            print(f'{comparison.name:<50} {comparison.change:>+8.1%} {flag}', file=log)
+
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+    elif args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'\nSaved the baseline to {args.baseline}', file=log)
+
+    return 1 if any(comparison.regression for comparison in comparisons) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Overhead of the user injecting middlewares, on a bare ASGI endpoint.
+Compare each case with `auth.no_middleware`.
+"""
+from fastcore.abstract.abstract_user import AbstractUser
+from fastcore.middlewares.inject_user import AuthInjectUserMiddleware, BaseInjectUserMiddleware
+
+from .fixtures import clear_auth_caches, make_client, make_token, use_client
+from .runner import benchmark
+
+
+async def endpoint(scope, receive, send):
+    await send({'type': 'http.response.start', 'status': 200, 'headers': [(b'content-type', b'text/plain')]})
+    await send({'type': 'http.response.body', 'body': b'ok'})
+
+
+async def user_endpoint(scope, receive, send):
+    assert await scope['state']['lazy_user'] is not None
+    await endpoint(scope, receive, send)
+
+
+async def receive():
+    return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+
+async def send(message):
+    pass
+
+
+def make_scope(token: str) -> dict:
+    return {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': '/',
+        'raw_path': b'/',
+        'query_string': b'',
+        'root_path': '',
+        'headers': [(b'host', b'bench'), (b'cookie', f'access_token={token}'.encode())],
+        'client': ('127.0.0.1', 1234),
+        'server': ('bench', 80),
+    }
+
+
+async def _call(app, clear: bool = False):
+    use_client(await make_client(count=0))
+    token = make_token()
+
+    async def call():
+        if clear:
+            clear_auth_caches()
+        await app(make_scope(token), receive, send)
+
+    yield call
+    clear_auth_caches()
+
+
+@benchmark('auth.no_middleware', number=20000)
+async def no_middleware():
+    async for call in _call(endpoint):
+        yield call
+
+
+@benchmark('auth.starlette_middleware', number=5000)
+async def starlette_middleware():
+    async for call in _call(AuthInjectUserMiddleware(endpoint, user_model=AbstractUser)):
+        yield call
+
+
+@benchmark('auth.starlette_middleware_cold_cache', number=500)
+async def starlette_middleware_cold_cache():
+    async for call in _call(AuthInjectUserMiddleware(endpoint, user_model=AbstractUser), clear=True):
+        yield call
+
+
+@benchmark('auth.lazy_middleware_unused', number=20000)
+async def lazy_middleware_unused():
+    async for call in _call(BaseInjectUserMiddleware(endpoint)):
+        yield call
+
+
+@benchmark('auth.lazy_middleware_awaited', number=5000)
+async def lazy_middleware_awaited():
+    async for call in _call(BaseInjectUserMiddleware(user_endpoint)):
+        yield call
@@ -0,0 +1,146 @@
+"""
+End-to-end requests through an httpx ASGI client: routing, middlewares, validation and rendering,
+on a `CustomClientApp` backed by the in-memory MongoDB stand-in.
+"""
+import asyncio
+
+import bcrypt
+import httpx
+from bson import ObjectId
+from fastapi import Depends
+
+from fastcore.app import CustomClientApp
+from fastcore.auth.password import PasswordHasher, verify_password
+from fastcore.middlewares.inject_user import BaseInjectUserMiddleware, get_request_user
+from fastcore.middlewares.request_id import RequestIdMiddleware
+from fastcore.pagination import Page
+from fastcore.repository import AsyncBaseRepository
+
+from .bench_password import ROUNDS
+from .fixtures import COLLECTION, DATABASE, Item, clear_auth_caches, make_client, make_token, use_client
+from .runner import benchmark
+
+CONCURRENCY = 10
+# Logins kept in flight by the login burst benchmarks
+LOGINS = 8
+
+
+async def make_app(fast_json_response: bool = True) -> CustomClientApp:
+    app = CustomClientApp(fast_json_response=fast_json_response)
+    app.client = await make_client()
+    use_client(app.client)
+    repository = AsyncBaseRepository(app.client, DATABASE, COLLECTION, Item)
+    app.add_middleware(BaseInjectUserMiddleware)
+    app.add_middleware(RequestIdMiddleware)
+
+    @app.get('/items/{item_id}', response_model=Item)
+    async def read_item(item_id: str):
+        return await repository.read({'_id': ObjectId(item_id)})
+
+    @app.get('/items', response_model=Page[Item])
+    async def list_items(after: str = None):
+        return await repository.paginate({}, limit=50, after=after)
+
+    # NOTE Returns documents without a `response_model`, through FastAPI's `jsonable_encoder`
+    @app.get('/documents')
+    async def list_documents():
+        return await app.client[DATABASE][COLLECTION].find({}).limit(50).to_list(None)
+
+    @app.get('/me')
+    async def me(user=Depends(get_request_user)):
+        return {'username': user.username}
+
+    return app
+
+
+async def _client(fast_json_response: bool = True):
+    app = await make_app(fast_json_response)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench', cookies={'access_token': make_token()}) as client:
+        item_id = str((await app.client[DATABASE][COLLECTION].find_one({}))['_id'])
+        yield client, item_id
+    clear_auth_caches()
+
+
+@benchmark('http.read_item', number=1000)
+async def read_item():
+    async for client, item_id in _client():
+        yield lambda: client.get(f'/items/{item_id}')
+
+
+@benchmark(f'http.read_item_concurrent_x{CONCURRENCY}', number=100, items=CONCURRENCY)
+async def read_item_concurrent():
+    async for client, item_id in _client():
+        yield lambda: asyncio.gather(*(client.get(f'/items/{item_id}') for _ in range(CONCURRENCY)))
+
+
+@benchmark('http.page_50', number=200)
+async def page():
+    async for client, _ in _client():
+        yield lambda: client.get('/items')
+
+
+@benchmark('http.page_50_default_response', number=200)
+async def page_default_response():
+    async for client, _ in _client(fast_json_response=False):
+        yield lambda: client.get('/items')
+
+
+@benchmark('http.documents_50', number=200)
+async def documents():
+    async for client, _ in _client():
+        yield lambda: client.get('/documents')
+
+
+@benchmark('http.authenticated_user', number=1000)
+async def authenticated_user():
+    async for client, _ in _client():
+        yield lambda: client.get('/me')
+
+
+async def _login_burst(blocking: bool):
+    """
+    Keeps `LOGINS` bcrypt verifications running in the background, through the `PasswordHasher` pool,
+    or on the event loop with the synchronous `verify_password` when `blocking`.
+    """
+    hasher = PasswordHasher(max_workers=2, rounds=ROUNDS)
+    hashed = bcrypt.hashpw(b'password', bcrypt.gensalt(rounds=ROUNDS)).decode()
+    stopped = asyncio.Event()
+
+    async def login():
+        while not stopped.is_set():
+            if blocking:
+                verify_password('password', hashed)
+                await asyncio.sleep(0)
+            else:
+                await hasher.verify('password', hashed)
+
+    tasks = [asyncio.create_task(login()) for _ in range(LOGINS)]
+    try:
+        yield
+    finally:
+        stopped.set()
+        await asyncio.gather(*tasks)
+        hasher.shutdown()
+
+
+async def _arriving(client: httpx.AsyncClient, url: str) -> httpx.Response:
+    # NOTE The in-memory stack never suspends, a request arriving from the network waits for the loop first
+    await asyncio.sleep(0)
+    return await client.get(url)
+
+
+# NOTE The latency of a request while logins run, compare with `http.read_item`.
+# With the pool it stays close, with the blocking verification it grows with the bcrypt cost.
+@benchmark('http.read_item_during_logins', number=200)
+async def read_item_during_logins():
+    async for _ in _login_burst(blocking=False):
+        async for client, item_id in _client():
+            yield lambda: _arriving(client, f'/items/{item_id}')
+
+
+@benchmark('http.read_item_during_blocking_logins', number=200)
+async def read_item_during_blocking_logins():
+    async for _ in _login_burst(blocking=True):
+        async for client, item_id in _client():
+            yield lambda: _arriving(client, f'/items/{item_id}')
@@ -0,0 +1,44 @@
+"""
+Hydration of 100 documents into the `fastcore.schemas` models, with each `Hydration` strategy.
+`construct` only wins on the models with costly validators, `business` and `social_profiles`,
+and loses to `validate` and `batch` on the plain `timestamped` one.
+"""
+from fastcore.hydration import Hydration, hydrate_many
+from fastcore.schemas.business import AbstractBusinessModel
+from fastcore.schemas.links_and_socials import SocialProfiles
+
+from .fixtures import Item, make_documents
+from .runner import benchmark
+
+BUSINESSES = [
+    {
+        'name': f'Business {i}',
+        'short_description': 'A business that does amazing things.',
+        'address': '123 Example Street, City, Country',
+        'phone': '+1234567890',
+        'email': 'info@example.com',
+        'website': 'https://www.example.com',
+        'logo': 'https://www.example.com/logo.png',
+    }
+    for i in range(100)
+]
+
+PROFILES = [
+    {'links': [{'url': f'https://social.example.com/{i}/{j}', 'category': 'Social'} for j in range(5)]}
+    for i in range(100)
+]
+
+
+def _hydrate(model, documents, strategy: Hydration):
+    async def setup():
+        yield lambda: hydrate_many(model, documents, strategy)
+    return setup
+
+
+for strategy in Hydration:
+    benchmark(f'hydration.timestamped_{strategy.value}_100', number=200, items=100)(
+        _hydrate(Item, make_documents(100), strategy))
+    benchmark(f'hydration.business_{strategy.value}_100', number=200, items=100)(
+        _hydrate(AbstractBusinessModel, BUSINESSES, strategy))
+    benchmark(f'hydration.social_profiles_{strategy.value}_100', number=200, items=100)(
+        _hydrate(SocialProfiles, PROFILES, strategy))
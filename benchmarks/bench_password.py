@@ -0,0 +1,27 @@
+"""
+Concurrent bcrypt verifications through the `PasswordHasher` pool.
+The cost defaults to 4, set `BENCH_BCRYPT_ROUNDS` to measure the production one.
+"""
+import asyncio
+import os
+
+import bcrypt
+
+from fastcore.auth.password import PasswordHasher
+
+from .runner import benchmark
+
+ROUNDS = int(os.getenv('BENCH_BCRYPT_ROUNDS', 4))
+CONCURRENCY = 8
+
+
+@benchmark(f'password.verify_x{CONCURRENCY}', number=20, items=CONCURRENCY)
+async def verify():
+    hasher = PasswordHasher(max_workers=2, rounds=ROUNDS)
+    hashed = bcrypt.hashpw(b'password', bcrypt.gensalt(rounds=ROUNDS)).decode()
+
+    async def operation():
+        await asyncio.gather(*(hasher.verify('password', hashed) for _ in range(CONCURRENCY)))
+
+    yield operation
+    hasher.shutdown()
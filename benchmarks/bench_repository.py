@@ -0,0 +1,91 @@
+"""
+`AsyncBaseRepository` CRUD against the in-memory MongoDB stand-in, so only fastcore and
+the BSON decoding are measured, not the network nor the server.
+"""
+from itertools import cycle
+
+from fastcore.cache import MemoryCacheBackend
+from fastcore.hydration import Hydration
+from fastcore.repository import AsyncBaseRepository, CachedAsyncRepository
+
+from .fixtures import COLLECTION, DATABASE, Item, ItemSummary, make_client, make_documents
+from .runner import benchmark
+
+
+async def _repository(count: int = 1000, hydration: Hydration = Hydration.validate) -> AsyncBaseRepository:
+    client = await make_client(count)
+    repository = AsyncBaseRepository(client, DATABASE, COLLECTION, Item)
+    repository.hydration = hydration
+    return repository
+
+
+async def _ids(repository: AsyncBaseRepository, count: int) -> list:
+    return [document['_id'] for document in await repository.collection.find({}, {'_id': 1}).limit(count).to_list()]
+
+
+@benchmark('repository.create', number=2000)
+async def create():
+    repository = await _repository(count=0)
+    documents = cycle(make_documents(20000))
+    yield lambda: repository.create(next(documents))
+
+
+@benchmark('repository.read', number=5000)
+async def read():
+    repository = await _repository()
+    _id = (await _ids(repository, 1))[0]
+    yield lambda: repository.read({'_id': _id})
+
+
+@benchmark('repository.read_cached', number=5000)
+async def read_cached():
+    client = await make_client(1000)
+    repository = CachedAsyncRepository(client, DATABASE, COLLECTION, Item, cache=MemoryCacheBackend())
+    _id = (await _ids(repository, 1))[0]
+    yield lambda: repository.read({'_id': _id})
+
+
+@benchmark('repository.read_many_100', number=200, items=100)
+async def read_many():
+    repository = await _repository()
+    ids = await _ids(repository, 100)
+    yield lambda: repository.read_many(ids)
+
+
+@benchmark('repository.list_100', number=200, items=100)
+async def list_100():
+    repository = await _repository(count=100)
+    yield lambda: repository.list({})
+
+
+@benchmark('repository.list_100_projected', number=200, items=100)
+async def list_100_projected():
+    repository = await _repository(count=100)
+    yield lambda: repository.list({}, view=ItemSummary)
+
+
+@benchmark('repository.list_100_construct', number=200, items=100)
+async def list_100_construct():
+    repository = await _repository(count=100, hydration=Hydration.construct)
+    yield lambda: repository.list({})
+
+
+@benchmark('repository.paginate_50', number=200, items=50)
+async def paginate():
+    repository = await _repository(count=100)
+    yield lambda: repository.paginate({}, limit=50)
+
+
+@benchmark('repository.update', number=5000)
+async def update():
+    repository = await _repository()
+    _id = (await _ids(repository, 1))[0]
+    yield lambda: repository.update({'_id': _id}, {'price': 10.0})
+
+
+@benchmark('repository.delete', number=2000)
+async def delete():
+    repository = await _repository(count=20000)
+    # NOTE Past 20000 operations, e.g. with `--scale`, deletes miss
+    ids = cycle(await _ids(repository, 20000))
+    yield lambda: repository.delete({'_id': next(ids)})
@@ -0,0 +1,79 @@
+"""
+Rendering 100 item documents as a JSON response: FastAPI's default path, orjson, and raw BSON.
+The `list_*` benchmarks also read the documents from the in-memory MongoDB stand-in, comparing
+the whole read paths, BSON decoding included, as raw documents are only decoded when rendered.
+"""
+import bson
+from bson import ObjectId
+from bson.raw_bson import RawBSONDocument
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from fastcore.repository import AsyncBaseRepository
+from fastcore.responses import FastJSONResponse, RawBSONResponse
+
+from .fixtures import COLLECTION, DATABASE, Item, make_client, make_documents
+from .runner import benchmark
+
+DOCUMENTS = make_documents(100)
+MODELS = [Item(**document) for document in DOCUMENTS]
+RAW_DOCUMENTS = [RawBSONDocument(bson.encode(document)) for document in DOCUMENTS]
+
+
+@benchmark('serialization.json_response_documents_100', number=500, items=100)
+async def json_response_documents():
+    yield lambda: JSONResponse(jsonable_encoder(DOCUMENTS, custom_encoder={ObjectId: str}))
+
+
+@benchmark('serialization.fast_json_response_documents_100', number=500, items=100)
+async def fast_json_response_documents():
+    yield lambda: FastJSONResponse(DOCUMENTS)
+
+
+@benchmark('serialization.json_response_models_100', number=500, items=100)
+async def json_response_models():
+    yield lambda: JSONResponse(jsonable_encoder(MODELS))
+
+
+@benchmark('serialization.fast_json_response_models_100', number=500, items=100)
+async def fast_json_response_models():
+    yield lambda: FastJSONResponse(MODELS)
+
+
+@benchmark('serialization.raw_bson_response_100', number=500, items=100)
+async def raw_bson_response():
+    yield lambda: RawBSONResponse(RAW_DOCUMENTS)
+
+
+async def _repository() -> AsyncBaseRepository:
+    return AsyncBaseRepository(await make_client(100), DATABASE, COLLECTION, Item)
+
+
+@benchmark('serialization.list_json_response_models_100', number=200, items=100)
+async def list_json_response_models():
+    repository = await _repository()
+
+    async def operation():
+        return JSONResponse(jsonable_encoder(await repository.list({})))
+
+    yield operation
+
+
+@benchmark('serialization.list_fast_json_response_models_100', number=200, items=100)
+async def list_fast_json_response_models():
+    repository = await _repository()
+
+    async def operation():
+        return FastJSONResponse(await repository.list({}))
+
+    yield operation
+
+
+@benchmark('serialization.list_raw_bson_response_100', number=200, items=100)
+async def list_raw_bson_response():
+    repository = await _repository()
+
+    async def operation():
+        return RawBSONResponse(await repository.list_raw({}))
+
+    yield operation
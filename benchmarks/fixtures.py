@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import bcrypt
+import jwt
+from bson import ObjectId
+from pydantic import BaseModel
+
+from fastcore.auth.tokens import ALGORITHM, SECRET_KEY, token_cache
+from fastcore.auth.user_cache import user_cache
+from fastcore.mongo_client import client_registry
+from fastcore.schemas.base import TimeStampedModel
+
+from .memory_mongo import MemoryClient
+
+DATABASE = 'bench'
+COLLECTION = 'items'
+USERNAME = 'bench'
+
+
+class Item(TimeStampedModel):
+    name: str
+    price: float
+    group: int
+    tags: List[str] = []
+    description: str = ''
+
+
+class ItemSummary(BaseModel):
+    name: str
+    price: float
+
+
+def make_documents(count: int) -> List[dict]:
+    """
+    Item documents, as stored in MongoDB, in groups of 100.
+    """
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            '_id': ObjectId(),
+            'name': f'item {i}',
+            'price': i * 1.5,
+            'group': i // 100,
+            'tags': ['bench', f'tag-{i % 7}'],
+            'description': 'x' * 200,
+            'created_at': now,
+            'updated_at': now,
+        }
+        for i in range(count)
+    ]
+
+
+async def make_client(count: int = 1000) -> MemoryClient:
+    """
+    An in-memory client, with `count` items and the benchmark user.
+    """
+    client = MemoryClient()
+    await client[DATABASE][COLLECTION].insert_many(make_documents(count))
+    password = bcrypt.hashpw(b'password', bcrypt.gensalt(rounds=4)).decode()
+    await client['users']['users'].insert_one({'username': USERNAME, 'password': password})
+    return client
+
+
+def use_client(client: MemoryClient) -> None:
+    """
+    Makes `client` the one of `get_settings()`, used by the auth helpers.
+    """
+    client_registry.register(client, debug=None)
+
+
+def make_token(username: str = USERNAME) -> str:
+    expires = datetime.now(timezone.utc) + timedelta(hours=1)
+    return jwt.encode({'sub': username, 'exp': expires}, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def clear_auth_caches() -> None:
+    token_cache.clear()
+    user_cache.clear()
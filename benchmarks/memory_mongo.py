@@ -0,0 +1,282 @@
+import copy
+from typing import Any, Dict, Iterable, List, Optional
+
+import bson
+from bson import ObjectId
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from pymongo.results import DeleteResult, InsertManyResult, InsertOneResult, UpdateResult
+
+
+_MISSING = object()
+
+
+class WireCounter:
+    """
+    The BSON bytes returned by the stand-in, as the server would send them.
+    """
+
+    def __init__(self):
+        self.bytes = 0
+
+
+wire = WireCounter()
+
+
+def _get(document: dict, path: str) -> Any:
+    value = document
+    for part in path.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _compare(value: Any, operator: str, operand: Any) -> bool:
+    if operator == '$exists':
+        return (value is not _MISSING) == bool(operand)
+    if operator == '$in':
+        return any(_equals(value, item) for item in operand)
+    if operator == '$nin':
+        return not any(_equals(value, item) for item in operand)
+    if operator == '$eq':
+        return _equals(value, operand)
+    if operator == '$ne':
+        return not _equals(value, operand)
+    if value is _MISSING or value is None:
+        return False
+    try:
+        if operator == '$gt':
+            return value > operand
+        if operator == '$gte':
+            return value >= operand
+        if operator == '$lt':
+            return value < operand
+        if operator == '$lte':
+            return value <= operand
+    except TypeError:
+        return False
+    raise NotImplementedError(f"Unsupported query operator: {operator}")
+
+
+def _equals(value: Any, operand: Any) -> bool:
+    if isinstance(value, list) and not isinstance(operand, list):
+        return operand in value
+    if value is _MISSING:
+        return operand is None
+    return value == operand
+
+
+def matches(document: dict, query: dict) -> bool:
+    """
+    Whether a document matches a query, supporting equality, comparisons, `$in`, `$exists`, `$and` and `$or`.
+    """
+    for key, condition in query.items():
+        if key == '$and':
+            if not all(matches(document, part) for part in condition):
+                return False
+        elif key == '$or':
+            if not any(matches(document, part) for part in condition):
+                return False
+        elif isinstance(condition, dict) and condition and all(op.startswith('$') for op in condition):
+            value = _get(document, key)
+            if not all(_compare(value, op, operand) for op, operand in condition.items()):
+                return False
+        elif not _equals(_get(document, key), condition):
+            return False
+    return True
+
+
+def project(document: dict, projection: Optional[dict]) -> dict:
+    """
+    Applies a top-level inclusion or exclusion projection.
+    """
+    if not projection:
+        return document
+    fields = {key.split('.')[0]: value for key, value in projection.items() if key != '_id'}
+    # NOTE `{'_id': 1}` alone is an inclusion
+    if any(fields.values()) or (not fields and projection['_id']):
+        projected = {key: value for key, value in document.items() if key in fields}
+        if projection.get('_id', 1) and '_id' in document:
+            projected['_id'] = document['_id']
+        return projected
+    excluded = set(fields) | ({'_id'} if not projection.get('_id', 1) else set())
+    return {key: value for key, value in document.items() if key not in excluded}
+
+
+class MemoryCursor:
+    """
+    A Motor-like cursor over the matched documents.
+    """
+
+    def __init__(self, collection: 'MemoryCollection', documents: List[dict], projection: Optional[dict]):
+        self._collection = collection
+        self._documents = documents
+        self._projection = projection
+        self._position = 0
+
+    def sort(self, key_or_list, direction: Optional[int] = None) -> 'MemoryCursor':
+        keys = [(key_or_list, direction or 1)] if isinstance(key_or_list, str) else list(key_or_list)
+        # NOTE Stable sorts, from the last key to the first
+        for key, order in reversed(keys):
+            self._documents.sort(key=lambda document: _sort_key(_get(document, key)), reverse=order == -1)
+        return self
+
+    def limit(self, limit: int) -> 'MemoryCursor':
+        if limit:
+            self._documents = self._documents[:limit]
+        return self
+
+    def skip(self, skip: int) -> 'MemoryCursor':
+        self._documents = self._documents[skip:]
+        return self
+
+    def batch_size(self, batch_size: int) -> 'MemoryCursor':
+        return self
+
+    async def to_list(self, length: Optional[int] = None) -> List[dict]:
+        end = len(self._documents) if length is None else self._position + length
+        batch = self._documents[self._position:end]
+        self._position += len(batch)
+        return [self._collection._read(document, self._projection) for document in batch]
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        if self._position >= len(self._documents):
+            raise StopAsyncIteration
+        document = self._documents[self._position]
+        self._position += 1
+        return self._collection._read(document, self._projection)
+
+
+def _sort_key(value: Any) -> tuple:
+    # NOTE Missing and null values sort first, as in MongoDB
+    if value is _MISSING or value is None:
+        return (0, 0)
+    return (1, value)
+
+
+class MemoryCollection:
+    """
+    An in-memory, Motor-like collection. The documents returned are projected, then BSON encoded
+    and decoded, so reads pay the wire format cost of the driver for the fields fetched, without the network.
+    Queries on `_id` are looked up, others scan the collection.
+    With a `RawBSONDocument` document class, the documents are returned undecoded, as by the driver.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._documents: Dict[Any, dict] = {}
+        self._document_class = dict
+
+    def _read(self, document: dict, projection: Optional[dict]) -> dict:
+        raw = bson.encode(project(document, projection))
+        wire.bytes += len(raw)
+        if self._document_class is RawBSONDocument:
+            return RawBSONDocument(raw)
+        return bson.decode(raw)
+
+    def _store(self, document: dict) -> None:
+        self._documents[document['_id']] = bson.decode(bson.encode(document))
+
+    def _match(self, query: Optional[dict]) -> List[dict]:
+        query = query or {}
+        if len(query) == 1 and '_id' in query:
+            condition = query['_id']
+            if not isinstance(condition, dict):
+                ids = [condition]
+            elif list(condition) == ['$in']:
+                ids = condition['$in']
+            else:
+                ids = None
+            if ids is not None:
+                return [self._documents[_id] for _id in ids if _id in self._documents]
+        return [document for document in self._documents.values() if matches(document, query)]
+
+    def with_options(self, codec_options: Optional[CodecOptions] = None, **kwargs) -> 'MemoryCollection':
+        if codec_options is None or codec_options.document_class is self._document_class:
+            return self
+        # NOTE A view sharing the documents, as the driver's collections share the server
+        view = copy.copy(self)
+        view._document_class = codec_options.document_class
+        return view
+
+    async def insert_one(self, document: dict) -> InsertOneResult:
+        document.setdefault('_id', ObjectId())
+        self._store(document)
+        return InsertOneResult(document['_id'], True)
+
+    async def insert_many(self, documents: Iterable[dict], ordered: bool = True) -> InsertManyResult:
+        ids = []
+        for document in documents:
+            ids.append((await self.insert_one(document)).inserted_id)
+        return InsertManyResult(ids, True)
+
+    async def find_one(self, query: Optional[dict] = None, projection: Optional[dict] = None, **kwargs) -> Optional[dict]:
+        found = self._match(query)
+        return self._read(found[0], projection) if found else None
+
+    def find(self, query: Optional[dict] = None, projection: Optional[dict] = None, **kwargs) -> MemoryCursor:
+        return MemoryCursor(self, self._match(query), projection)
+
+    async def update_one(self, query: dict, update: dict, upsert: bool = False) -> UpdateResult:
+        found = self._match(query)
+        if not found:
+            return UpdateResult({'n': 0, 'nModified': 0}, True)
+        document = bson.decode(bson.encode(found[0]))
+        for key, value in update.get('$set', {}).items():
+            document[key] = value
+        for key in update.get('$unset', {}):
+            document.pop(key, None)
+        for key, value in update.get('$inc', {}).items():
+            document[key] = document.get(key, 0) + value
+        self._store(document)
+        return UpdateResult({'n': 1, 'nModified': 1}, True)
+
+    async def delete_one(self, query: dict) -> DeleteResult:
+        found = self._match(query)
+        if found:
+            del self._documents[found[0]['_id']]
+        return DeleteResult({'n': len(found[:1])}, True)
+
+    async def count_documents(self, query: dict) -> int:
+        return len(self._match(query))
+
+
+class MemoryDatabase:
+
+    def __init__(self, name: str):
+        self.name = name
+        self._collections: Dict[str, MemoryCollection] = {}
+
+    def get_collection(self, name: str) -> MemoryCollection:
+        if name not in self._collections:
+            self._collections[name] = MemoryCollection(name)
+        return self._collections[name]
+
+    __getitem__ = get_collection
+
+    async def command(self, command: str, **kwargs) -> dict:
+        return {'ok': 1.0}
+
+
+class MemoryClient:
+    """
+    An in-memory stand-in for `AsyncIOMotorClient`, covering what the repositories use.
+    """
+
+    def __init__(self):
+        self._databases: Dict[str, MemoryDatabase] = {}
+        self.admin = self.get_database('admin')
+
+    def get_database(self, name: str) -> MemoryDatabase:
+        if name not in self._databases:
+            self._databases[name] = MemoryDatabase(name)
+        return self._databases[name]
+
+    __getitem__ = get_database
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,209 @@
+import asyncio
+import gc
+import importlib
+import inspect
+import os
+import pkgutil
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from .memory_mongo import wire
+
+
+class Benchmark(BaseModel):
+    """
+    A registered benchmark. `setup` is an async generator, yielding the operation to time.
+    """
+    name: str
+    setup: Callable[[], AsyncIterator[Callable]]
+    number: int
+    rounds: int
+    items: int
+
+
+class Result(BaseModel):
+    """
+    The timings of a benchmark, per operation, in seconds.
+    """
+    name: str
+    number: int
+    rounds: int
+    items: int
+    best: float
+    median: float
+    stdev: float
+    ops_per_sec: float
+    items_per_sec: float
+    # BSON bytes read from the in-memory MongoDB stand-in, when used
+    bytes_per_op: Optional[float] = None
+    # Median peak of the memory allocated while running one operation, traced with `tracemalloc`
+    peak_bytes_per_op: Optional[float] = None
+
+
+class Comparison(BaseModel):
+    name: str
+    baseline: float
+    current: float
+    change: float
+    regression: bool
+
+
+_benchmarks: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, number: int = 1000, rounds: int = 5, items: int = 1):
+    """
+    Registers a benchmark.
+
+    Usage:
+        @benchmark('repository.read', number=2000)
+        async def read():
+            repository = ...
+            yield lambda: repository.read({'_id': _id})
+
+    Args:
+        name (str): The name, as `group.case`.
+        number (int, optional): The operations per round. Defaults to 1000.
+        rounds (int, optional): The timed rounds, the median is compared. Defaults to 5.
+        items (int, optional): The items handled per operation, e.g. requests or documents. Defaults to 1.
+    """
+    def decorator(setup):
+        _benchmarks[name] = Benchmark(name=name, setup=setup, number=number, rounds=rounds, items=items)
+        return setup
+    return decorator
+
+
+def discover() -> Dict[str, Benchmark]:
+    """
+    Imports every `benchmarks.bench_*` module, registering their benchmarks.
+    """
+    package = importlib.import_module('benchmarks')
+    for module in pkgutil.iter_modules(package.__path__):
+        if module.name.startswith('bench_'):
+            importlib.import_module(f'benchmarks.{module.name}')
+    return _benchmarks
+
+
+async def _time(operation: Callable, number: int, is_async: bool) -> float:
+    started = time.perf_counter()
+    if is_async:
+        for _ in range(number):
+            await operation()
+    else:
+        for _ in range(number):
+            operation()
+    return (time.perf_counter() - started) / number
+
+
+async def _peak_allocation(operation: Callable, number: int, is_async: bool) -> float:
+    # NOTE Traced apart from the timings, `tracemalloc` slows every allocation down
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(number):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            result = operation()
+            if is_async:
+                result = await result
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+            del result
+    finally:
+        tracemalloc.stop()
+    return statistics.median(peaks)
+
+
+async def run(bench: Benchmark, scale: float = 1.0) -> Result:
+    """
+    Runs a benchmark: a warm-up round, then `rounds` timed rounds, with the GC disabled while timing,
+    then a few traced operations measuring their peak allocation.
+    """
+    number = max(int(bench.number * scale), 1)
+    async with asynccontextmanager(bench.setup)() as operation:
+        # NOTE Operations may be coroutine functions, or return awaitables, e.g. `lambda: repository.read(...)`
+        probe = operation()
+        is_async = inspect.isawaitable(probe)
+        if is_async:
+            await probe
+        await _time(operation, max(number // 10, 1), is_async)
+        timings = []
+        wire_bytes = wire.bytes
+        for _ in range(bench.rounds):
+            gc.collect()
+            gc.disable()
+            try:
+                timings.append(await _time(operation, number, is_async))
+            finally:
+                gc.enable()
+        wire_bytes = wire.bytes - wire_bytes
+        peak_bytes = await _peak_allocation(operation, min(number, 10), is_async)
+    median = statistics.median(timings)
+    return Result(
+        name=bench.name,
+        number=number,
+        rounds=bench.rounds,
+        items=bench.items,
+        best=min(timings),
+        median=median,
+        stdev=statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        ops_per_sec=1 / median,
+        items_per_sec=bench.items / median,
+        bytes_per_op=wire_bytes / (number * bench.rounds) if wire_bytes else None,
+        peak_bytes_per_op=peak_bytes,
+    )
+
+
+async def run_all(benchmarks: List[Benchmark], scale: float = 1.0,
+                  progress: Optional[Callable[[Result], None]] = None) -> Dict[str, Result]:
+    results = {}
+    for bench in benchmarks:
+        results[bench.name] = result = await run(bench, scale)
+        if progress is not None:
+            progress(result)
+    return results
+
+
+def metadata() -> dict:
+    return {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def compare(results: Dict[str, Result], baseline: Dict[str, dict], threshold: float) -> List[Comparison]:
+    """
+    Compares the median timings with a baseline.
+    A benchmark slower than the baseline by more than `threshold`, e.g. 0.25 for 25%, is a regression.
+    Benchmarks missing from either side are skipped.
+    """
+    comparisons = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        previous = baseline[name]['median']
+        change = result.median / previous - 1
+        comparisons.append(Comparison(name=name, baseline=previous, current=result.median,
+                                      change=change, regression=change > threshold))
+    return comparisons
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.2f}{unit}'
+    return f'{seconds / 1e-9:.0f}ns'
+
+
+def run_sync(coroutine):
+    return asyncio.run(coroutine)
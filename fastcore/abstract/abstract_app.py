@@ -1,9 +1,14 @@
 from abc import ABC, abstractmethod
+from typing import Optional
 
 from fastapi import FastAPI
 from motor.motor_asyncio import AsyncIOMotorClient
 
+from fastcore.change_streams import ChangeStreamInvalidator
+from fastcore.health import HealthMonitor
 from fastcore.logger import setup_logger
+from fastcore.responses import FastJSONResponse
+from fastcore.serialization import register_bson_encoders
 
 
 class AbstractApp(FastAPI, ABC):
@@ -12,8 +17,16 @@ class AbstractApp(FastAPI, ABC):
     This enforces that derived classes implement specific methods for managing settings and resources.
     """
     client: AsyncIOMotorClient
-
-    def __init__(self, *args, **kwargs):
+    # Started by the `ClientLifespan`, when set
+    change_streams: Optional[ChangeStreamInvalidator] = None
+    health_monitor: Optional[HealthMonitor] = None
+
+    def __init__(self, *args, fast_json_response: bool = False, **kwargs):
+        # NOTE Makes the orjson based `FastJSONResponse` the default response class.
+        # FastAPI still runs `jsonable_encoder` first, so it is taught the BSON types too.
+        if fast_json_response:
+            kwargs.setdefault('default_response_class', FastJSONResponse)
+            register_bson_encoders()
         super().__init__(*args, **kwargs)
         self.logger = setup_logger(self._type())
 
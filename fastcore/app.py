@@ -1,31 +1,43 @@
 
+import asyncio
 from contextlib import asynccontextmanager
 import os
 from fastcore.client_handler import ClientHandler
+from fastcore.indexes import sync_indexes
+from fastcore.mongo_client import client_registry
+from fastcore.request import UserRoute
+from fastcore.logger import start_logging_pipeline, stop_logging_pipeline
+from fastcore.warmup import warm_up
 from fastcore.abstract.abstract_app import AbstractApp
 
 
 class CustomClientApp(AbstractApp):
     """
     A custom App class to better handle the database connections.
-    It has a client, that is a ClientHandler class, with a singleton pattern.
+    Its client comes from the `client_registry`, shared with the routers of the same configuration.
     """
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        # NOTE Handlers receive a `UserRequest`, e.g. for `await request.get_user()`
+        self.router.route_class = UserRoute
 
         self.logger.debug('App Started')
 
     async def set_client(self, client_debug):
         """Set up custom settings, like database connections."""
         try:
+            # NOTE The helpers without an app at hand, e.g. `get_settings()`, use this configuration too
+            client_registry.set_default(client_debug)
             self.client = ClientHandler(client_debug).client
         except Exception as e:
-            self.logger.error(e)
+            # NOTE A bad configuration, like an empty `MONGODB_API`, fails the startup
+            self.logger.error('Could not create the database client: %s', e)
+            raise
 
     async def shutdown(self):
         """Close any open resources (e.g., database connections)."""
-        self.client.close()
+        client_registry.close_all()
 
 
 @asynccontextmanager
@@ -34,8 +46,43 @@ async def ClientLifespan(app: AbstractApp):
     Custom lifespan to init the app.client
     """
     DEBUG = os.getenv('DEBUG')
+    # NOTE In production, refuse to start without the declared indexes, instead of building them under traffic
+    INDEXES_FAIL_IF_MISSING = os.getenv('INDEXES_FAIL_IF_MISSING', '').lower() in ('1', 'true')
+    # NOTE Opens the pool and touches the registered collections before serving, failing on errors
+    MONGO_WARMUP = os.getenv('MONGO_WARMUP', '').lower() in ('1', 'true')
 
-    await app.set_client(DEBUG)
+    # NOTE Log writes happen on a background thread from here on
+    start_logging_pipeline()
+    index_sync = None
+    # NOTE A failed startup tears down what already started too, and flushes the logs of the failure
+    try:
+        try:
+            await app.set_client(DEBUG)
+            if INDEXES_FAIL_IF_MISSING:
+                await sync_indexes(app.client, fail_if_missing=True)
+            else:
+                index_sync = asyncio.create_task(sync_indexes(app.client))
+            if app.health_monitor is not None:
+                app.health_monitor.start(app.client)
+            if MONGO_WARMUP:
+                await warm_up(app.client)
+            if app.change_streams is not None:
+                app.change_streams.start(app.client)
+        except Exception as e:
+            app.logger.error('Startup failed: %s', e)
+            raise
+        if app.health_monitor is not None:
+            # NOTE Readiness stays false until here
+            app.health_monitor.started.set()
 
-    yield
-    await app.shutdown()
+        yield
+    finally:
+        if app.health_monitor is not None:
+            await app.health_monitor.stop()
+        if index_sync is not None and not index_sync.done():
+            index_sync.cancel()
+            await asyncio.gather(index_sync, return_exceptions=True)
+        if app.change_streams is not None:
+            await app.change_streams.stop()
+        await app.shutdown()
+        stop_logging_pipeline()
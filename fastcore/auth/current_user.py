@@ -1,32 +1,68 @@
-import os
-from typing import Type
+from typing import Optional, Type
 from fastapi import HTTPException
 import jwt
 
 from starlette.authentication import AuthCredentials
 from fastcore.request import UserRequest
 from fastcore.abstract.abstract_user import TUser, AbstractUser
+from fastcore.auth.tokens import ALGORITHM, SECRET_KEY, decode_token  # noqa
+from fastcore.auth.user_cache import user_cache
+from fastcore.cache import MISSING
 from fastcore.client_handler import get_settings
+from fastcore.indexes import index, index_registry
+from fastcore.types import CLIENTS, COLLECTIONS
 
 import logging
 
-SECRET_KEY = os.getenv('SECRET_KEY', 'change_me')
-ALGORITHM = os.getenv('ALGORITHM', 'HS256')
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 logger = logging.getLogger('get_user')
 
+# Every authenticated request looks the user up by username
+# NOTE Not unique, existing duplicates would fail the build; make it unique in the app once the data allows it
+index_registry.register('users', 'users', [index('username')])
 
-async def get_token_user(token: str, user_model: Type[TUser] = AbstractUser):
+
+async def find_user(collection: COLLECTIONS, username: str, expires_at: Optional[float] = None) -> Optional[dict]:
+    """
+    Finds the user document by username, through the `user_cache`.
+
+    Args:
+        collection (COLLECTIONS): The users collection.
+        username (str): The token `sub`.
+        expires_at (float, optional): The token `exp`, bounding how long the user is cached.
+
+    Returns:
+        Optional[dict]: The user document, or None if not found.
+    """
+    user = user_cache.get(username)
+    if user is MISSING:
+        user = await collection.find_one({"username": username})
+        if user is not None:
+            user_cache.set(username, user, expires_at)
+    return user
+
+
+async def get_token_user(token: str, user_model: Type[TUser] = AbstractUser, client: Optional[CLIENTS] = None):
+    """
+    Authenticates a token, returning the credentials and the user, or `(None, None)`.
+
+    Args:
+        token (str): The access token.
+        user_model (Type[TUser], optional): The model of the user. Defaults to `AbstractUser`.
+        client (CLIENTS, optional): The client of the app, e.g. `request.app.client`. Defaults to the `get_settings` one.
+    """
     if not token:
         return None, None
     try:
-        payload: dict = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload: dict = decode_token(token)
         username = payload.get("sub")
         if username is None:
             return None, None
 
-        user = await get_settings().client.get_database('users').get_collection('users').find_one({"username": username})
+        if client is None:
+            client = get_settings().client
+        user = await find_user(client.get_database('users').get_collection('users'), username, payload.get("exp"))
         if user is None:
             return None, None
 
@@ -45,11 +81,11 @@ async def get_current_user(request: UserRequest, user_model: Type[TUser]):
     if not token:
         return None
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         username = payload.get("sub")
         if username is None:
             return None
-        user = await request.app.client.get_database('users').get_collection('users').find_one({"username": username})
+        user = await find_user(request.app.client.get_database('users').get_collection('users'), username, payload.get("exp"))
         if user is None:
             return None
         return user_model(**user)
@@ -65,11 +101,11 @@ async def get_current_user_enforce(request: UserRequest):
     if not token:
         raise HTTPException(status_code=403, detail="Not authenticated")
     try:
-        payload: dict = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload: dict = decode_token(token)
         username = payload.get("sub")
         if username is None:
             raise HTTPException(status_code=403, detail="Not authenticated")
-        user = request.app.client.get_database('users').get_collection('users').find_one({"username": username})
+        user = await find_user(request.app.client.get_database('users').get_collection('users'), username, payload.get("exp"))
         if user is None:
             raise HTTPException(status_code=403, detail="Not authenticated")
         return user
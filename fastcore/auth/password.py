@@ -1,4 +1,8 @@
+import asyncio
 import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Optional, Tuple
 
 import bcrypt
 from datetime import datetime, timedelta, timezone
@@ -7,15 +11,17 @@ import jwt
 SECRET_KEY = os.getenv('SECRET_KEY', 'change_me')
 ALGORITHM = os.getenv('ALGORITHM', 'HS256')
 ACCESS_TOKEN_EXPIRE_MINUTES = 1
+# The bcrypt cost factor, each increment doubles the hashing time
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))
 
 
-def hash_password(password: str) -> str:
+def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
     """
     Hashes the user password.
     Returns:
         str: The Hashed password
     """
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds)
     hashed_password = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed_password.decode('utf-8')
 
@@ -24,6 +30,112 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
 
+def needs_rehash(hashed_password: str, rounds: int = BCRYPT_ROUNDS) -> bool:
+    """
+    Whether the password was hashed with another cost factor than the configured one.
+    """
+    try:
+        return int(hashed_password.split('$')[2]) != rounds
+    except (IndexError, ValueError):
+        return True
+
+
+class PasswordHasherBusy(RuntimeError):
+    """
+    Raised when too many hashing operations are already queued.
+    """
+    pass
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt off the event loop, in a dedicated and bounded executor.
+    bcrypt releases the GIL while hashing, so a thread pool runs in parallel.
+    Once `max_pending` operations are running or queued, new ones fail fast with `PasswordHasherBusy`,
+    so a login burst can not pile up unbounded work.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 64, rounds: int = BCRYPT_ROUNDS,
+                 executor: Optional[Executor] = None):
+        """
+        Args:
+            max_workers (int, optional): Threads of the default executor. Defaults to 2.
+            max_pending (int, optional): Maximum operations running or queued. Defaults to 64.
+            rounds (int, optional): The bcrypt cost factor. Defaults to `BCRYPT_ROUNDS`.
+            executor (Executor, optional): Another executor, e.g. a `ProcessPoolExecutor`.
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self.pending = 0
+        self.rejected = 0
+        self._executor = executor
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='bcrypt')
+        return self._executor
+
+    async def _run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusy(f'{self.pending} password operations pending')
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, partial(fn, *args))
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        """
+        Hashes the user password, with the configured cost factor.
+        """
+        return await self._run(hash_password, password, self.rounds)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verifies the password, and rehashes it if the cost factor changed.
+        Call it on login, and store the new hash when there is one.
+
+        Returns:
+            Tuple[bool, Optional[str]]: Whether the password is valid, and the new hash if it was rehashed.
+        """
+        if not await self.verify(plain_password, hashed_password):
+            return False, None
+        if needs_rehash(hashed_password, self.rounds):
+            return True, await self.hash(plain_password)
+        return True, None
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=int(os.getenv('BCRYPT_WORKERS', 2)),
+    max_pending=int(os.getenv('BCRYPT_MAX_PENDING', 64)),
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hashes the user password, off the event loop.
+    """
+    return await password_hasher.hash(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verifies the user password, off the event loop.
+    """
+    return await password_hasher.verify(plain_password, hashed_password)
+
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
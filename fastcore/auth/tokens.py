@@ -0,0 +1,48 @@
+import hashlib
+import os
+import time
+
+import jwt
+
+from fastcore.cache import MISSING, TTLCache
+
+SECRET_KEY = os.getenv('SECRET_KEY', 'change_me')
+ALGORITHM = os.getenv('ALGORITHM', 'HS256')
+
+# Verified tokens, by digest, expiring with the token itself
+token_cache = TTLCache(
+    maxsize=int(os.getenv('TOKEN_CACHE_SIZE', 4096)),
+    ttl=float(os.getenv('TOKEN_CACHE_TTL', 300)),
+)
+
+
+def _digest(token: str) -> bytes:
+    # NOTE The tokens themselves are credentials, only their digest is kept
+    return hashlib.blake2b(token.encode('utf-8'), digest_size=16).digest()
+
+
+def decode_token(token: str) -> dict:
+    """
+    Verifies and decodes a JWT, skipping the signature check for tokens already verified.
+    The cached claims are shared, and must be treated as read-only.
+
+    Args:
+        token (str): The encoded token.
+
+    Returns:
+        dict: The claims.
+
+    Raises:
+        jwt.ExpiredSignatureError: If the token has expired.
+        jwt.PyJWTError: If the token is invalid.
+    """
+    key = _digest(token)
+    payload = token_cache.get(key)
+    if payload is not MISSING:
+        return payload
+
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    expires_at = payload.get('exp')
+    ttl = None if expires_at is None else expires_at - time.time()
+    token_cache.set(key, payload, ttl)
+    return payload
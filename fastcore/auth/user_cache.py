@@ -0,0 +1,108 @@
+import os
+import time
+from typing import Any, Dict, Optional
+
+from fastcore.cache import TTLCache
+from fastcore.change_streams import ChangeStreamInvalidator
+
+
+class UserCache:
+    """
+    A bounded cache of the authenticated users documents, keyed by the token `sub`.
+    An entry lives at most `ttl` seconds, and never past the expiry of the token that loaded it.
+    Call `invalidate` on password changes and deactivations, so they take effect immediately in this process.
+    Other workers keep their entry up to `ttl` seconds, unless the cache is wired to the
+    `users.users` change stream with `watch_users`.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 60.0):
+        """
+        Args:
+            maxsize (int, optional): Maximum number of cached users. Defaults to 10000.
+            ttl (float, optional): Maximum seconds a user is cached. Defaults to 60.
+        """
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, username: str) -> Any:
+        """Get the user document, or `MISSING`."""
+        return self.cache.get(username)
+
+    def set(self, username: str, user: dict, expires_at: Optional[float] = None) -> None:
+        """
+        Cache the user document.
+
+        Args:
+            username (str): The token `sub`.
+            user (dict): The user document.
+            expires_at (float, optional): The token `exp`, as a UNIX timestamp.
+        """
+        ttl = self.cache.ttl
+        if expires_at is not None:
+            ttl = min(ttl, expires_at - time.time())
+        self.cache.set(username, user, ttl)
+
+    def invalidate(self, username: str) -> None:
+        """Drop a user, e.g. on a password change or a deactivation."""
+        self.cache.delete(username)
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    @property
+    def hits(self) -> int:
+        return self.cache.hits
+
+    @property
+    def misses(self) -> int:
+        return self.cache.misses
+
+    def stats(self) -> Dict[str, int]:
+        return self.cache.stats()
+
+
+class UserCacheInvalidation:
+    """
+    Clears a `UserCache` on the changes of the users collection, for the `ChangeStreamInvalidator`.
+    The change events carry no username, so any write to the users clears the whole cache.
+    """
+
+    def __init__(self, cache: UserCache):
+        self.cache = cache
+
+    async def invalidate(self, namespace: str) -> None:
+        self.cache.clear()
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, UserCacheInvalidation) and other.cache is self.cache
+
+    def __hash__(self) -> int:
+        return id(self.cache)
+
+
+user_cache = UserCache(
+    maxsize=int(os.getenv('USER_CACHE_SIZE', 10_000)),
+    ttl=float(os.getenv('USER_CACHE_TTL', 60)),
+)
+
+
+def invalidate_user(username: str) -> None:
+    """
+    Drop a user from the cache of this process.
+    Call it whenever the password changes or the user is deactivated.
+    The other workers keep the user up to `USER_CACHE_TTL` seconds, unless `watch_users` is used.
+    """
+    user_cache.invalidate(username)
+
+
+def watch_users(change_streams: ChangeStreamInvalidator, cache: UserCache = user_cache,
+                database_name: str = 'users', collection_name: str = 'users') -> None:
+    """
+    Clears the user cache of every worker on the writes to the users collection,
+    so password changes and deactivations made anywhere take effect immediately.
+    Call it before the `ClientLifespan` starts the change streams.
+
+    Usage:
+        app.change_streams = ChangeStreamInvalidator()
+        watch_users(app.change_streams)
+    """
+    change_streams.register(database_name, collection_name, UserCacheInvalidation(cache))
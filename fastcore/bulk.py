@@ -0,0 +1,114 @@
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from pydantic import BaseModel, Field
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReplaceOne, UpdateMany, UpdateOne
+from pymongo.results import BulkWriteResult
+
+from .types import CLIENTS
+
+# The server default for `maxWriteBatchSize`, used until the topology is known
+MAX_WRITE_BATCH_SIZE = 100_000
+
+BulkOperation = Union[InsertOne, UpdateOne, UpdateMany, ReplaceOne, DeleteOne, DeleteMany]
+
+
+def update(query: dict, data: dict, upsert: bool = False) -> UpdateOne:
+    """
+    A bulk update, with the same `$set` semantics as `repository.update`.
+    """
+    return UpdateOne(query, {"$set": data}, upsert=upsert)
+
+
+def upsert(query: dict, data: dict) -> UpdateOne:
+    """
+    A bulk upsert, with the same `$set` semantics as `repository.update`.
+    """
+    return update(query, data, upsert=True)
+
+
+def max_write_batch_size(client: CLIENTS) -> int:
+    """
+    The smallest `maxWriteBatchSize` among the writable servers the client knows of.
+    """
+    sizes = [
+        server.max_write_batch_size
+        for server in client.topology_description.server_descriptions().values()
+        if server.is_writable
+    ]
+    return min(sizes) if sizes else MAX_WRITE_BATCH_SIZE
+
+
+def chunked(operations: Iterable[BulkOperation], size: int) -> Iterator[List[BulkOperation]]:
+    """
+    Splits the operations in lists of at most `size`, without materializing the whole iterable.
+    """
+    iterator = iter(operations)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class BulkWriteFailure(BaseModel):
+    """
+    A failed operation of a bulk write.
+    `index` is the position of the operation in the submitted sequence.
+    """
+    index: int
+    code: Optional[int] = None
+    message: str
+
+
+class BulkWriteReport(BaseModel):
+    """
+    The structured result of `repository.bulk_write`, aggregated across chunks.
+    """
+    inserted_count: int = 0
+    matched_count: int = 0
+    modified_count: int = 0
+    deleted_count: int = 0
+    upserted_count: int = 0
+    upserted_ids: Dict[int, Any] = Field(default_factory=dict)
+    errors: List[BulkWriteFailure] = Field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def add_result(self, result: BulkWriteResult, offset: int) -> None:
+        """
+        Adds the result of a successful chunk.
+        """
+        if not result.acknowledged:
+            return
+        self.inserted_count += result.inserted_count
+        self.matched_count += result.matched_count
+        self.modified_count += result.modified_count
+        self.deleted_count += result.deleted_count
+        self.upserted_count += result.upserted_count
+        for index, _id in result.upserted_ids.items():
+            self.upserted_ids[offset + index] = _id
+
+    def add_details(self, details: dict, offset: int) -> None:
+        """
+        Adds the details of a `BulkWriteError` raised by a chunk.
+        """
+        self.inserted_count += details.get('nInserted', 0)
+        self.matched_count += details.get('nMatched', 0)
+        self.modified_count += details.get('nModified', 0)
+        self.deleted_count += details.get('nRemoved', 0)
+        self.upserted_count += details.get('nUpserted', 0)
+        for upserted in details.get('upserted', []):
+            self.upserted_ids[offset + upserted['index']] = upserted['_id']
+        for error in details.get('writeErrors', []):
+            self.errors.append(BulkWriteFailure(index=offset + error['index'], code=error.get('code'), message=error.get('errmsg', '')))
+        for error in details.get('writeConcernErrors', []):
+            self.errors.append(BulkWriteFailure(index=offset, code=error.get('code'), message=error.get('errmsg', '')))
+
+    def add_failure(self, offset: int, error: Exception) -> None:
+        """
+        Adds a chunk that failed as a whole, e.g. on a network error.
+        """
+        self.errors.append(BulkWriteFailure(index=offset, message=str(error)))
@@ -0,0 +1,166 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+# Returned on a cache miss, since `None` is a valid cached value, e.g. a document that was not found
+MISSING = object()
+
+
+class TTLCache:
+    """
+    A bounded in-process cache, evicting the least recently used entries and the expired ones.
+    It is not thread-safe, it is meant to be used from the event loop.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0, timer: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            maxsize (int, optional): Maximum number of entries. Defaults to 1024.
+            ttl (float, optional): Default time to live of the entries, in seconds. Defaults to 60.
+            timer (Callable[[], float], optional): The clock. Defaults to `time.monotonic`.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        self._data: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= self.timer():
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            self._data.pop(key, None)
+            return
+        self._data[key] = (self.timer() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {'size': len(self._data), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheBackend(ABC):
+    """
+    The storage of the repository cache.
+    Entries are grouped by namespace, usually `database.collection`, and a namespace is
+    invalidated as a whole by bumping its version, which makes its old keys unreachable.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    @abstractmethod
+    async def get(self, key: Hashable) -> Any:
+        """Get an entry, or `MISSING`."""
+        pass
+
+    @abstractmethod
+    async def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Set an entry, with an optional time to live override."""
+        pass
+
+    @abstractmethod
+    async def version(self, namespace: str) -> int:
+        """The current version of a namespace."""
+        pass
+
+    @abstractmethod
+    async def invalidate(self, namespace: str) -> None:
+        """Invalidate every entry of a namespace."""
+        pass
+
+    async def get_or_load(self, namespace: str, key: Hashable, loader: Callable[[], Awaitable[Any]],
+                          ttl: Optional[float] = None) -> Any:
+        """
+        Read through the cache.
+        Concurrent misses on the same key share a single load, so a hot key expiring does not stampede the database.
+
+        Args:
+            namespace (str): The namespace of the entry.
+            key (Hashable): The key of the entry, within the namespace.
+            loader (Callable[[], Awaitable[Any]]): Loads the value on a miss.
+            ttl (float, optional): Time to live override.
+
+        Returns:
+            Any: The cached or loaded value.
+        """
+        # The version is read before loading, so a load racing an invalidation is stored as stale
+        full_key = (namespace, await self.version(namespace), key)
+        value = await self.get(full_key)
+        if value is not MISSING:
+            return value
+
+        # NOTE The load runs in its own task, shared by every caller, so cancelling one caller,
+        # the first one included, does not cancel the others
+        load = self._inflight.get(full_key)
+        if load is None:
+            load = asyncio.ensure_future(self._load(full_key, loader, ttl))
+            self._inflight[full_key] = load
+            load.add_done_callback(lambda task: self._done(full_key, task))
+        return await asyncio.shield(load)
+
+    async def _load(self, full_key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: Optional[float]) -> Any:
+        value = await loader()
+        await self.set(full_key, value, ttl)
+        return value
+
+    def _done(self, full_key: Hashable, task: asyncio.Future) -> None:
+        if self._inflight.get(full_key) is task:
+            del self._inflight[full_key]
+        # Mark the exception as retrieved, when every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    An in-process cache backend, bounded by LRU and TTL eviction.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        """
+        Args:
+            maxsize (int, optional): Maximum number of entries. Defaults to 1024.
+            ttl (float, optional): Default time to live of the entries, in seconds. Defaults to 60.
+        """
+        super().__init__()
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._versions: Dict[str, int] = {}
+
+    async def get(self, key: Hashable) -> Any:
+        return self.cache.get(key)
+
+    async def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        self.cache.set(key, value, ttl)
+
+    async def version(self, namespace: str) -> int:
+        return self._versions.get(namespace, 0)
+
+    async def invalidate(self, namespace: str) -> None:
+        self._versions[namespace] = self._versions.get(namespace, 0) + 1
+
+    def stats(self) -> Dict[str, int]:
+        return self.cache.stats()
@@ -0,0 +1,190 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from typing import Any, AsyncContextManager, AsyncIterator, Callable, Dict, List, Optional, Protocol
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from .logger import setup_logger
+from .types import CLIENTS, COLLECTIONS
+
+# Server error codes
+CHANGE_STREAM_HISTORY_LOST = 286
+CHANGE_STREAMS_UNSUPPORTED = 40573
+
+# Marks a resume token not loaded from the store yet
+MISSING_TOKEN = object()
+
+# Only the resume token and the event type are needed to invalidate
+_PIPELINE = [{'$project': {'operationType': 1}}]
+
+
+class Invalidates(Protocol):
+    """
+    What a change stream invalidates, a `CacheBackend` or e.g. the `UserCacheInvalidation`.
+    """
+
+    async def invalidate(self, namespace: str) -> None:
+        ...
+
+
+WatchSource = Callable[[COLLECTIONS, Optional[dict]], AsyncContextManager[AsyncIterator[dict]]]
+
+
+def watch_collection(collection: COLLECTIONS, resume_after: Optional[dict]) -> AsyncContextManager[AsyncIterator[dict]]:
+    """
+    The default change stream source, a Motor change stream on the collection.
+    """
+    return collection.watch(_PIPELINE, resume_after=resume_after)
+
+
+class ResumeTokenStore(ABC):
+    """
+    Persists the last seen resume token of each namespace, so restarts do not miss events.
+    """
+
+    @abstractmethod
+    async def load(self, namespace: str) -> Optional[dict]:
+        pass
+
+    @abstractmethod
+    async def save(self, namespace: str, token: Optional[dict]) -> None:
+        pass
+
+
+class MemoryResumeTokenStore(ResumeTokenStore):
+    """
+    An in-process token store, resuming across reconnections but not restarts.
+    """
+
+    def __init__(self) -> None:
+        self.tokens: Dict[str, Optional[dict]] = {}
+
+    async def load(self, namespace: str) -> Optional[dict]:
+        return self.tokens.get(namespace)
+
+    async def save(self, namespace: str, token: Optional[dict]) -> None:
+        self.tokens[namespace] = token
+
+
+class MongoResumeTokenStore(ResumeTokenStore):
+    """
+    Stores the resume tokens in a MongoDB collection, one document per namespace.
+    """
+
+    def __init__(self, client: CLIENTS, database_name: str = 'fastcore', collection_name: str = 'resume_tokens'):
+        self.collection: COLLECTIONS = client[database_name][collection_name]
+
+    async def load(self, namespace: str) -> Optional[dict]:
+        document = await self.collection.find_one({'_id': namespace})
+        return document.get('token') if document else None
+
+    async def save(self, namespace: str, token: Optional[dict]) -> None:
+        await self.collection.update_one({'_id': namespace}, {'$set': {'token': token}}, upsert=True)
+
+
+class ChangeStreamInvalidator:
+    """
+    Invalidates in-process caches from MongoDB change streams.
+    Each worker holds its own caches, so a write made by any worker, or any other client,
+    invalidates the namespace everywhere. It requires a replica set or a sharded cluster.
+
+    Usage:
+        app.change_streams = ChangeStreamInvalidator()
+        app.change_streams.register('business', 'profiles', cache)
+        watch_users(app.change_streams)  # from `fastcore.auth.user_cache`
+    """
+
+    def __init__(self, token_store: Optional[ResumeTokenStore] = None, watch: WatchSource = watch_collection,
+                 checkpoint_interval: float = 5.0, retry_delay: float = 1.0):
+        """
+        Args:
+            token_store (ResumeTokenStore, optional): Where to keep the resume tokens. Defaults to a MongoDB collection.
+            watch (WatchSource, optional): Opens the change stream of a collection, replace it to use a fake source.
+            checkpoint_interval (float, optional): Minimum seconds between resume token saves. Defaults to 5.
+            retry_delay (float, optional): Seconds to wait before reopening a failed stream. Defaults to 1.
+        """
+        self.token_store = token_store
+        self.watch = watch
+        self.checkpoint_interval = checkpoint_interval
+        self.retry_delay = retry_delay
+        self.logger = setup_logger(self.__class__.__name__)
+        self._caches: Dict[tuple, List[Invalidates]] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def register(self, database_name: str, collection_name: str, cache: Invalidates) -> None:
+        """
+        Register a cache to invalidate on the changes of a collection.
+        The namespace invalidated is `database.collection`, as used by `CachedAsyncRepository`.
+        """
+        caches = self._caches.setdefault((database_name, collection_name), [])
+        if cache not in caches:
+            caches.append(cache)
+
+    def start(self, client: CLIENTS) -> None:
+        """
+        Start watching the registered collections, in background tasks.
+        """
+        if self.token_store is None:
+            self.token_store = MongoResumeTokenStore(client)
+        for (database_name, collection_name), caches in self._caches.items():
+            collection = client[database_name][collection_name]
+            task = asyncio.create_task(self._run(f'{database_name}.{collection_name}', collection, caches))
+            self._tasks.append(task)
+        self.logger.info('Watching %s collections', len(self._tasks))
+
+    async def stop(self) -> None:
+        """
+        Stop watching, saving the last resume tokens.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _invalidate(self, namespace: str, caches: List[Invalidates]) -> None:
+        for cache in caches:
+            await cache.invalidate(namespace)
+
+    async def _run(self, namespace: str, collection: COLLECTIONS, caches: List[Invalidates]) -> None:
+        token = saved = MISSING_TOKEN
+        while True:
+            try:
+                if token is MISSING_TOKEN:
+                    token = saved = await self.token_store.load(namespace)
+                async with self.watch(collection, token) as stream:
+                    # Changes may have been missed while the stream was closed
+                    await self._invalidate(namespace, caches)
+                    checkpoint = time.monotonic()
+                    async for change in stream:
+                        await self._invalidate(namespace, caches)
+                        # An `invalidate` event closes the stream, and its token can not be resumed after
+                        token = None if change.get('operationType') == 'invalidate' else change.get('_id')
+                        if time.monotonic() - checkpoint >= self.checkpoint_interval:
+                            await self.token_store.save(namespace, token)
+                            saved, checkpoint = token, time.monotonic()
+            except asyncio.CancelledError:
+                if token is not MISSING_TOKEN and token != saved:
+                    await self._save(namespace, token)
+                raise
+            except OperationFailure as e:
+                if e.code == CHANGE_STREAMS_UNSUPPORTED:
+                    self.logger.error('Change streams are not supported by the server, not watching %s', namespace)
+                    return
+                if e.code == CHANGE_STREAM_HISTORY_LOST:
+                    self.logger.warning('Resume token of %s is no longer in the oplog, restarting the stream', namespace)
+                    token = None
+                else:
+                    self.logger.error('Change stream of %s failed: %s', namespace, e)
+            except PyMongoError as e:
+                self.logger.error('Change stream of %s failed: %s', namespace, e)
+            if token is not MISSING_TOKEN and token != saved:
+                saved = token
+                await self._save(namespace, token)
+            await asyncio.sleep(self.retry_delay)
+
+    async def _save(self, namespace: str, token: Any) -> None:
+        try:
+            await self.token_store.save(namespace, token)
+        except PyMongoError as e:
+            self.logger.error('Failed to save the resume token of %s: %s', namespace, e)
@@ -1,28 +1,24 @@
-from functools import lru_cache
+from fastcore.mongo_client import client_registry
+from fastcore.types import CLIENTS
 
-from fastcore.mongo_client import get_async_mongo_client
-from fastcore.singleton import SingletonMeta
-from fastcore.logger import setup_logger
 
-
-class ClientHandler(metaclass=SingletonMeta):
+class ClientHandler:
     """
     A class to hold a mongodb client connection.
-    It follows a singleton pattern, to avoid multiple clients.
+    The client comes from the `client_registry`, so every handler of the same configuration
+    shares it, and it is only created on first use, in the worker process.
+    A `debug` of None follows the configuration of the app.
     """
 
-    def __init__(self, debug) -> None:
+    def __init__(self, debug=None) -> None:
         self.debug = debug
-        self.client = get_async_mongo_client(debug=self.debug)
-        self.logger = setup_logger(__class__.__name__)
-        self.logger.info('Client Started')
+
+    @property
+    def client(self) -> CLIENTS:
+        return client_registry.get(debug=self.debug)
 
 
-@lru_cache
-def get_settings(debug: bool = True) -> 'ClientHandler':
-    try:
-        return ClientHandler(debug)
-    finally:
-        # You can handle connection closing here if needed per request,
-        # otherwise manage it at the application lifecycle
-        pass
+def get_settings(debug: bool = None) -> 'ClientHandler':
+    # NOTE Cheap, the client is only created when `.client` is first read.
+    # Without `debug`, it is the client of the app, as configured by `CustomClientApp.set_client`.
+    return ClientHandler(debug)
@@ -0,0 +1,212 @@
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set
+
+from bson import json_util
+from fastapi import APIRouter
+from pydantic import BaseModel
+from pymongo.errors import PyMongoError
+
+from .logger import setup_logger
+from .types import COLLECTIONS
+
+
+class QueryPlanError(RuntimeError):
+    """
+    Raised by the `QueryPlanGuard`, in raise mode, on a query missing its index.
+    """
+    pass
+
+
+class PlanFinding(BaseModel):
+    """
+    The aggregated plans of a query shape.
+    """
+    namespace: str
+    shape: str
+    stages: List[str]
+    count: int = 0
+    docs_examined: int = 0
+    keys_examined: int = 0
+    returned: int = 0
+    max_execution_ms: int = 0
+    collscan: bool = False
+    violations: int = 0
+
+    @property
+    def examined_ratio(self) -> float:
+        return self.docs_examined / max(self.returned, 1)
+
+
+def query_shape(query: Any) -> Any:
+    """
+    Replaces the values of a query by `?`, keeping its fields and operators.
+    """
+    if isinstance(query, dict):
+        return {key: query_shape(value) for key, value in query.items()}
+    if isinstance(query, (list, tuple)) and any(isinstance(value, dict) for value in query):
+        return [query_shape(value) for value in query]
+    return '?'
+
+
+def winning_stages(plan: dict) -> List[str]:
+    """
+    Lists the stages of a winning plan, from the root, for both the classic and the SBE explain formats.
+    """
+    plan = plan.get('queryPlan', plan)
+    stages = [plan['stage']] if 'stage' in plan else []
+    children = plan.get('inputStages', [])
+    if 'inputStage' in plan:
+        children = [plan['inputStage'], *children]
+    for child in children:
+        stages.extend(winning_stages(child))
+    return stages
+
+
+class QueryPlanGuard:
+    """
+    An opt-in diagnostic, running `explain()` on a sample of the repository queries.
+    It flags collection scans and queries examining many more documents than they return.
+    The explains run in the background, except in raise mode, and queries with an empty filter,
+    scanning the collection by design, are not sampled.
+
+    Usage:
+        AsyncBaseRepository.plan_guard = QueryPlanGuard(sample_rate=0.05)
+    """
+
+    def __init__(self, sample_rate: float = 0.01, max_examined_ratio: float = 100.0, min_examined: int = 100,
+                 raise_on_violation: bool = False, max_shapes: int = 1000):
+        """
+        Args:
+            sample_rate (float, optional): Fraction of the queries explained. Defaults to 0.01.
+            max_examined_ratio (float, optional): Maximum documents examined per document returned. Defaults to 100.
+            min_examined (int, optional): Documents examined under which the ratio is ignored. Defaults to 100.
+            raise_on_violation (bool, optional): Raise `QueryPlanError` instead of logging, e.g. in tests. Defaults to False.
+            max_shapes (int, optional): Maximum number of query shapes kept. Defaults to 1000.
+        """
+        self.sample_rate = sample_rate
+        self.max_examined_ratio = max_examined_ratio
+        self.min_examined = min_examined
+        self.raise_on_violation = raise_on_violation
+        self.max_shapes = max_shapes
+        self.logger = setup_logger(self.__class__.__name__)
+        self._findings: Dict[tuple, PlanFinding] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def should_sample(self) -> bool:
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def record(self, namespace: str, query: dict, explain: dict) -> PlanFinding:
+        """
+        Records the explain output of a query, logging or raising on a violation.
+        """
+        shape = json_util.dumps(query_shape(query), sort_keys=True)
+        stats = explain.get('executionStats', {})
+        stages = winning_stages(explain.get('queryPlanner', {}).get('winningPlan', {}))
+
+        finding = self._findings.get((namespace, shape))
+        if finding is None:
+            finding = PlanFinding(namespace=namespace, shape=shape, stages=stages)
+            if len(self._findings) < self.max_shapes:
+                self._findings[(namespace, shape)] = finding
+        finding.stages = stages
+        finding.count += 1
+        finding.docs_examined += stats.get('totalDocsExamined', 0)
+        finding.keys_examined += stats.get('totalKeysExamined', 0)
+        finding.returned += stats.get('nReturned', 0)
+        finding.max_execution_ms = max(finding.max_execution_ms, stats.get('executionTimeMillis', 0))
+
+        collscan = 'COLLSCAN' in stages
+        examined = stats.get('totalDocsExamined', 0)
+        ratio = examined / max(stats.get('nReturned', 0), 1)
+        finding.collscan = finding.collscan or collscan
+        if collscan or (examined >= self.min_examined and ratio > self.max_examined_ratio):
+            finding.violations += 1
+            message = f'Query {shape} on {namespace}: stages {stages}, examined {examined} documents, ratio {ratio:.1f}'
+            if self.raise_on_violation:
+                raise QueryPlanError(message)
+            self.logger.warning(message)
+        return finding
+
+    @staticmethod
+    def _cursor(collection: COLLECTIONS, query: dict, sort: Optional[list], limit: Optional[int]):
+        # NOTE The limit changes the plan, and how many documents are examined
+        cursor = collection.find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        if limit:
+            cursor = cursor.limit(limit)
+        return cursor
+
+    def inspect(self, collection: COLLECTIONS, query: dict, sort: Optional[list] = None,
+                limit: Optional[int] = None) -> Optional[PlanFinding]:
+        """
+        Explains a query with PyMongo.
+        """
+        try:
+            explain = self._cursor(collection, query, sort, limit).explain()
+        except PyMongoError as e:
+            self.logger.error('Failed to explain query: %s', e)
+            return None
+        return self.record(collection.full_name, query, explain)
+
+    async def inspect_async(self, collection: COLLECTIONS, query: dict, sort: Optional[list] = None,
+                            limit: Optional[int] = None) -> Optional[PlanFinding]:
+        """
+        Explains a query with Motor.
+        """
+        try:
+            explain = await self._cursor(collection, query, sort, limit).explain()
+        except PyMongoError as e:
+            self.logger.error('Failed to explain query: %s', e)
+            return None
+        return self.record(collection.full_name, query, explain)
+
+    def inspect_later(self, collection: COLLECTIONS, query: dict, sort: Optional[list] = None,
+                      limit: Optional[int] = None) -> None:
+        """
+        Explains a PyMongo query in a background thread, so the sampled request does not wait for it.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='explain')
+        self._executor.submit(self.inspect, collection, query, sort, limit).add_done_callback(self._finished)
+
+    def inspect_async_later(self, collection: COLLECTIONS, query: dict, sort: Optional[list] = None,
+                            limit: Optional[int] = None) -> None:
+        """
+        Explains a Motor query in a background task, so the sampled request does not wait for it.
+        """
+        task = asyncio.create_task(self.inspect_async(collection, query, sort, limit))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        task.add_done_callback(self._finished)
+
+    def _finished(self, future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            self.logger.error('Background explain failed: %s', future.exception())
+
+    def findings(self) -> List[dict]:
+        """
+        The aggregated findings, the worst first.
+        """
+        findings = sorted(self._findings.values(), key=lambda f: (f.violations, f.examined_ratio), reverse=True)
+        return [{**finding.model_dump(), 'examined_ratio': finding.examined_ratio} for finding in findings]
+
+    def reset(self) -> None:
+        self._findings.clear()
+
+
+def query_plan_router(guard: QueryPlanGuard, prefix: str = '/debug') -> APIRouter:
+    """
+    A router exposing the findings of a guard, at `GET {prefix}/query-plans`.
+    Only include it in debug deployments.
+    """
+    router = APIRouter(prefix=prefix, tags=['debug'])
+
+    @router.get('/query-plans')
+    async def query_plans():
+        return guard.findings()
+
+    return router
@@ -0,0 +1,113 @@
+"""
+Gunicorn settings for running a fastcore app with uvicorn workers.
+
+Usage:
+    gunicorn -c python:fastcore.gunicorn_conf app.main:app
+    python -m fastcore.serve app.main:app
+
+Every setting can be tuned through an env, e.g. `WEB_CONCURRENCY`, `MAX_REQUESTS` or `UVICORN_LOOP`.
+"""
+import math
+import os
+from typing import Optional
+
+from uvicorn_worker import UvicornWorker
+
+from fastcore.logger import setup_logger
+from fastcore.mongo_client import client_registry
+
+logger = setup_logger('Gunicorn')
+
+CGROUP_V2_CPU_MAX = '/sys/fs/cgroup/cpu.max'
+CGROUP_V1_DIRS = ('/sys/fs/cgroup/cpu', '/sys/fs/cgroup/cpu,cpuacct')
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_limit() -> Optional[float]:
+    """
+    The CPU quota of the container, from cgroup v2 `cpu.max` or cgroup v1 `cfs_quota_us`.
+
+    Returns:
+        Optional[float]: The CPUs allowed, or None when unlimited.
+    """
+    cpu_max = _read(CGROUP_V2_CPU_MAX)
+    if cpu_max:
+        quota, _, period = cpu_max.partition(' ')
+        if quota != 'max' and period:
+            return int(quota) / int(period)
+        return None
+    for directory in CGROUP_V1_DIRS:
+        quota = _read(os.path.join(directory, 'cpu.cfs_quota_us'))
+        period = _read(os.path.join(directory, 'cpu.cfs_period_us'))
+        if quota and period and int(quota) > 0:
+            return int(quota) / int(period)
+    return None
+
+
+def available_cpus() -> float:
+    """
+    The CPUs this process can use: its affinity mask, bounded by the cgroup quota.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    limit = cgroup_cpu_limit()
+    return min(cpus, limit) if limit is not None else cpus
+
+
+def worker_count(cpus: Optional[float] = None) -> int:
+    """
+    The number of workers, `WEB_CONCURRENCY` when set, else `WORKERS_PER_CORE` per available CPU.
+    Async workers do not wait on I/O, so one per core is the default, instead of the sync `2n + 1`.
+    Bounded by `MAX_WORKERS` when set.
+    """
+    if os.getenv('WEB_CONCURRENCY'):
+        return max(int(os.environ['WEB_CONCURRENCY']), 1)
+    cpus = cpus if cpus is not None else available_cpus()
+    count = max(math.ceil(cpus * float(os.getenv('WORKERS_PER_CORE', '1'))), 1)
+    if os.getenv('MAX_WORKERS'):
+        count = min(count, int(os.environ['MAX_WORKERS']))
+    return count
+
+
+class Worker(UvicornWorker):
+    """
+    The uvicorn worker, with the event loop and HTTP parser from `UVICORN_LOOP` and `UVICORN_HTTP`.
+    """
+    CONFIG_KWARGS = {
+        'loop': os.getenv('UVICORN_LOOP', 'auto'),  # auto, uvloop or asyncio
+        'http': os.getenv('UVICORN_HTTP', 'auto'),  # auto, httptools or h11
+    }
+
+
+bind = os.getenv('BIND', f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8000')}")
+workers = worker_count()
+worker_class = 'fastcore.gunicorn_conf.Worker'
+loglevel = os.getenv('LOG_LEVEL', 'info')
+
+# NOTE Restarts each worker after a randomized number of requests, to contain leaks without restarting all at once
+max_requests = int(os.getenv('MAX_REQUESTS', '10000'))
+max_requests_jitter = int(os.getenv('MAX_REQUESTS_JITTER', '1000'))
+
+timeout = int(os.getenv('TIMEOUT', '60'))
+# NOTE Time for in-flight requests and the lifespan shutdown on restarts
+graceful_timeout = int(os.getenv('GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.getenv('KEEP_ALIVE', '5'))
+preload_app = os.getenv('PRELOAD', '').lower() in ('1', 'true')
+
+
+def when_ready(server):
+    logger.info('Serving on %s with %s workers %s', ', '.join(server.cfg.bind), server.cfg.workers, Worker.CONFIG_KWARGS)
+
+
+def post_fork(server, worker):
+    # NOTE With `preload_app`, clients created in the master must not be used by the workers
+    client_registry.reset()
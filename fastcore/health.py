@@ -0,0 +1,158 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+from pymongo.errors import OperationFailure, PyMongoError
+
+from .logger import setup_logger
+from .monitoring import PoolMetrics, pool_metrics_of
+from .schemas.utils import utc_now
+from .types import CLIENTS
+
+
+class HealthState(BaseModel):
+    """
+    The last result of the background database probe.
+    """
+    ready: bool = False
+    database: bool = False
+    degraded: List[str] = Field(default_factory=list)
+    checked_at: Optional[datetime] = None
+    latency_ms: Optional[float] = None
+    pool_saturation: float = 0.0
+    replication_lag_s: Optional[float] = None
+    error: Optional[str] = None
+
+
+def replication_lag(status: dict) -> Optional[float]:
+    """
+    The lag of the most lagging secondary behind the primary, in seconds, from `replSetGetStatus`.
+    """
+    members = status.get('members', [])
+    primary = next((member for member in members if member.get('stateStr') == 'PRIMARY'), None)
+    secondaries = [member for member in members if member.get('stateStr') == 'SECONDARY']
+    if primary is None or not secondaries:
+        return None
+    return max((primary['optimeDate'] - member['optimeDate']).total_seconds() for member in secondaries)
+
+
+class HealthMonitor:
+    """
+    Probes MongoDB on an interval in the background, and caches the result.
+    The health endpoints only read the cached state, so probes cost nothing per call.
+
+    Usage:
+        app.health_monitor = HealthMonitor()
+        app.include_router(health_router(app.health_monitor))
+    """
+
+    def __init__(self, interval: float = 5.0, timeout: float = 2.0, max_pool_saturation: float = 0.9,
+                 max_replication_lag: float = 10.0, metrics: Optional[PoolMetrics] = None):
+        """
+        Args:
+            interval (float, optional): Seconds between probes. Defaults to 5.
+            timeout (float, optional): Seconds before a probe fails. Defaults to 2.
+            max_pool_saturation (float, optional): Pool saturation above which the worker is degraded. Defaults to 0.9.
+            max_replication_lag (float, optional): Replication lag, in seconds, above which the worker is degraded. Defaults to 10.
+            metrics (PoolMetrics, optional): The pool metrics listener of the client. Defaults to the one of the started client.
+        """
+        self.interval = interval
+        self.timeout = timeout
+        self.max_pool_saturation = max_pool_saturation
+        self.max_replication_lag = max_replication_lag
+        self.metrics = metrics
+        self.state = HealthState()
+        # Set once startup tasks, such as the warm-up, are done
+        self.started = asyncio.Event()
+        self.logger = setup_logger(self.__class__.__name__)
+        self._client: Optional[CLIENTS] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, client: CLIENTS) -> None:
+        self._client = client
+        if self.metrics is None:
+            self.metrics = pool_metrics_of(client)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def is_ready(self, state: HealthState) -> bool:
+        """
+        Ready once the startup is done and a probe, possibly still running at the end of the startup,
+        reached the database without degradation.
+        """
+        return self.started.is_set() and state.checked_at is not None and state.database and not state.degraded
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
+
+    async def _replication_lag(self) -> Optional[float]:
+        try:
+            status = await asyncio.wait_for(self._client.admin.command('replSetGetStatus'), self.timeout)
+        except OperationFailure:
+            # Not a replica set, or not allowed to read its status
+            return None
+        except (PyMongoError, asyncio.TimeoutError) as e:
+            # NOTE The ping answered, only a failed ping makes the database unreachable
+            self.logger.warning('Replication status unavailable: %s', str(e) or e.__class__.__name__)
+            return None
+        return replication_lag(status)
+
+    async def check(self) -> HealthState:
+        """
+        Probes the database and updates the cached state.
+        """
+        state = HealthState(checked_at=utc_now())
+        try:
+            started = time.perf_counter()
+            await asyncio.wait_for(self._client.admin.command('ping'), self.timeout)
+            state.latency_ms = 1000 * (time.perf_counter() - started)
+            state.database = True
+            state.replication_lag_s = await self._replication_lag()
+        except (PyMongoError, asyncio.TimeoutError) as e:
+            state.error = str(e) or e.__class__.__name__
+            state.degraded.append('database unreachable')
+
+        # NOTE Clients not made by `fastcore.mongo_client` have no metrics
+        state.pool_saturation = self.metrics.saturation() if self.metrics is not None else 0.0
+        if state.pool_saturation > self.max_pool_saturation:
+            state.degraded.append(f'pool saturation {state.pool_saturation:.0%}')
+        if state.replication_lag_s is not None and state.replication_lag_s > self.max_replication_lag:
+            state.degraded.append(f'replication lag {state.replication_lag_s:.1f}s')
+
+        state.ready = self.is_ready(state)
+        if state.degraded and not self.state.degraded:
+            self.logger.warning('Health degraded: %s', ', '.join(state.degraded))
+        self.state = state
+        return state
+
+
+def health_router(monitor: HealthMonitor, prefix: str = '/health') -> APIRouter:
+    """
+    The liveness and readiness endpoints.
+    `GET {prefix}/live` only tells the process answers, `GET {prefix}/ready` returns the cached
+    state, with a 503 while starting or degraded, so the load balancer stops routing to the worker.
+    """
+    router = APIRouter(prefix=prefix, tags=['health'])
+
+    @router.get('/live')
+    async def live():
+        return {'status': 'alive'}
+
+    @router.get('/ready')
+    async def ready():
+        # NOTE Readiness follows the end of the startup, without waiting for the next probe
+        state = monitor.state.model_copy(update={'ready': monitor.is_ready(monitor.state)})
+        return JSONResponse(state.model_dump(mode='json'), status_code=200 if state.ready else 503)
+
+    return router
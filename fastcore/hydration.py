@@ -0,0 +1,53 @@
+from enum import Enum
+from functools import lru_cache
+from typing import List, Type, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+
+_T = TypeVar('_T', bound=BaseModel)
+
+
+class Hydration(str, Enum):
+    """
+    How the repositories turn MongoDB documents into models.
+
+    `batch` is the fast option for lists, with the same result as `validate`.
+    `construct` is not a general speed-up: `model_construct` runs in Python, where validation runs in
+    pydantic-core, so it is slower than `validate` on plain models, e.g. ~2x on the benchmarks `Item`.
+    It only pays off on models with costly validators, e.g. `EmailStr` or `HttpUrl` fields, on trusted data.
+    """
+    # Full validation of every document, `model(**document)`
+    validate = 'validate'
+    # No validation, `model.model_construct(**document)`, only for trusted data with costly validators.
+    # Nested models are left as dicts, values are not coerced, e.g. no `str` to `HttpUrl`.
+    construct = 'construct'
+    # Full validation, in a single `TypeAdapter(List[model])` call per batch. The fast option for lists.
+    batch = 'batch'
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: Type[_T]) -> TypeAdapter:
+    """
+    The cached adapter validating a list of `model`.
+    """
+    return TypeAdapter(List[model])
+
+
+def hydrate(model: Type[_T], document: dict, strategy: Hydration = Hydration.validate) -> _T:
+    """
+    Hydrates a single document.
+    """
+    if strategy is Hydration.construct:
+        return model.model_construct(**document)
+    return model(**document)
+
+
+def hydrate_many(model: Type[_T], documents: List[dict], strategy: Hydration = Hydration.validate) -> List[_T]:
+    """
+    Hydrates a batch of documents.
+    """
+    if strategy is Hydration.batch:
+        return list_adapter(model).validate_python(documents)
+    if strategy is Hydration.construct:
+        return [model.model_construct(**document) for document in documents]
+    return [model(**document) for document in documents]
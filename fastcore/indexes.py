@@ -0,0 +1,142 @@
+from typing import Dict, List, Optional, Tuple, Union
+
+from pydantic import BaseModel
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import PyMongoError
+
+from .logger import setup_logger
+from .types import CLIENTS
+
+IndexKey = Tuple[str, Union[int, str]]
+
+
+class IndexesMissingError(RuntimeError):
+    """
+    Raised on startup when declared indexes are missing, and creating them is not allowed.
+    """
+    pass
+
+
+class IndexSpec(BaseModel):
+    """
+    A declared index: single-field, compound, unique, TTL or partial.
+    """
+    keys: List[IndexKey]
+    name: Optional[str] = None
+    unique: bool = False
+    sparse: bool = False
+    expire_after_seconds: Optional[int] = None
+    partial_filter: Optional[dict] = None
+
+    def to_index_model(self) -> IndexModel:
+        options = {}
+        if self.name:
+            options['name'] = self.name
+        if self.unique:
+            options['unique'] = True
+        if self.sparse:
+            options['sparse'] = True
+        if self.expire_after_seconds is not None:
+            options['expireAfterSeconds'] = self.expire_after_seconds
+        if self.partial_filter is not None:
+            options['partialFilterExpression'] = self.partial_filter
+        return IndexModel(self.keys, **options)
+
+    @property
+    def index_name(self) -> str:
+        return self.to_index_model().document['name']
+
+
+def index(*keys: Union[str, IndexKey], **options) -> IndexSpec:
+    """
+    Shortcut to declare an index, plain field names are ascending.
+
+    Usage:
+        index('username', unique=True)
+        index(('business_id', 1), ('created_at', -1))
+        index('created_at', expire_after_seconds=3600)
+    """
+    return IndexSpec(keys=[(key, ASCENDING) if isinstance(key, str) else key for key in keys], **options)
+
+
+class IndexRegistry:
+    """
+    The indexes declared for each collection, synced on startup by the `ClientLifespan`.
+    """
+
+    def __init__(self) -> None:
+        self._indexes: Dict[Tuple[str, str], Dict[str, IndexSpec]] = {}
+
+    def register(self, database_name: str, collection_name: str, specs: List[IndexSpec]) -> None:
+        declared = self._indexes.setdefault((database_name, collection_name), {})
+        for spec in specs:
+            declared.setdefault(spec.index_name, spec)
+
+    def undeclared(self, database_name: str, collection_name: str, specs: List[IndexSpec]) -> List[IndexSpec]:
+        """
+        The specs not registered for the collection.
+        """
+        declared = self._indexes.get((database_name, collection_name), {})
+        return [spec for spec in specs if spec.index_name not in declared]
+
+    def collections(self) -> List[Tuple[str, str]]:
+        return list(self._indexes)
+
+    def items(self) -> List[Tuple[Tuple[str, str], List[IndexSpec]]]:
+        return [(namespace, list(specs.values())) for namespace, specs in self._indexes.items()]
+
+
+index_registry = IndexRegistry()
+
+
+async def missing_indexes(client: CLIENTS, registry: IndexRegistry = index_registry) -> Dict[Tuple[str, str], List[IndexSpec]]:
+    """
+    Diffs the declared indexes against `list_indexes()`.
+    An index exists if an index with the same name, or the same keys, exists.
+
+    Returns:
+        Dict[Tuple[str, str], List[IndexSpec]]: The missing indexes, by `(database, collection)`.
+    """
+    missing = {}
+    for (database_name, collection_name), specs in registry.items():
+        collection = client[database_name][collection_name]
+        names, keys = set(), set()
+        async for existing in collection.list_indexes():
+            names.add(existing['name'])
+            keys.add(tuple(existing['key'].items()))
+        absent = [spec for spec in specs if spec.index_name not in names and tuple(spec.keys) not in keys]
+        if absent:
+            missing[(database_name, collection_name)] = absent
+    return missing
+
+
+async def sync_indexes(client: CLIENTS, registry: IndexRegistry = index_registry, fail_if_missing: bool = False) -> None:
+    """
+    Creates the missing declared indexes.
+
+    Args:
+        client (CLIENTS): The async MongoDB client.
+        registry (IndexRegistry, optional): The declared indexes. Defaults to the global registry.
+        fail_if_missing (bool, optional): Raise instead of creating them, e.g. in production. Defaults to False.
+
+    Raises:
+        IndexesMissingError: If indexes are missing and `fail_if_missing` is set.
+    """
+    logger = setup_logger('IndexSync')
+    try:
+        missing = await missing_indexes(client, registry)
+    except PyMongoError as e:
+        if fail_if_missing:
+            raise
+        logger.error('Failed to list indexes: %s', e)
+        return
+    if fail_if_missing and missing:
+        described = ', '.join(f'{db}.{coll}: {[spec.index_name for spec in specs]}' for (db, coll), specs in missing.items())
+        raise IndexesMissingError(f'Missing indexes: {described}')
+
+    for (database_name, collection_name), specs in missing.items():
+        try:
+            await client[database_name][collection_name].create_indexes([spec.to_index_model() for spec in specs])
+            logger.info('Created indexes %s on %s.%s', [spec.index_name for spec in specs], database_name, collection_name)
+        except PyMongoError as e:
+            logger.error('Failed to create indexes on %s.%s: %s', database_name, collection_name, e)
@@ -0,0 +1,114 @@
+import asyncio
+from typing import Any, Callable, Dict, Generic, Iterable, List, Optional, Set, Type, TypeVar
+
+from pydantic import BaseModel
+
+from .repository import AsyncBaseRepository
+
+_T = TypeVar('_T', bound=BaseModel)
+
+
+class RepositoryLoader(Generic[_T]):
+    """
+    A request-scoped loader, batching `read`-by-key calls into one `$in` query.
+    Every `load` made in the same event-loop tick, e.g. under `asyncio.gather`, is sent together,
+    and each key is only fetched once for the lifetime of the loader.
+    Database errors are raised to the callers of the batch, and the failed keys are not kept.
+
+    Usage:
+        users = await asyncio.gather(*(loader.load(post.author_id) for post in posts))
+    """
+
+    def __init__(self, repository: AsyncBaseRepository, key: str = '_id', projection: Optional[dict] = None,
+                 view: Optional[Type[BaseModel]] = None):
+        """
+        Args:
+            repository (AsyncBaseRepository): The repository to read from.
+            key (str, optional): A unique field to load by. Defaults to '_id'.
+            projection (dict, optional): Fields to fetch, requires a `view`. Defaults to the whole document, or to the `view` fields.
+            view (Type[BaseModel], optional): A partial model to hydrate the documents with.
+        """
+        self.repository = repository
+        self.key = key
+        self.projection = projection
+        self.view = view
+        self._futures: Dict[Any, asyncio.Future] = {}
+        self._pending: List[Any] = []
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def load(self, key: Any) -> Optional[_T]:
+        """
+        Load a document by key.
+
+        Args:
+            key (Any): The key value.
+
+        Returns:
+            Optional[_T]: The document if found, or None if not found.
+
+        Raises:
+            PyMongoError: If the batch query failed.
+        """
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._futures[key] = future
+            if not self._pending:
+                loop.call_soon(self._schedule)
+            self._pending.append(key)
+        # Shielded, so a cancelled caller does not cancel the result for the others
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[Any]) -> List[Optional[_T]]:
+        """
+        Load many documents by key, in a single batch.
+
+        Args:
+            keys (Iterable[Any]): The key values.
+
+        Returns:
+            List[Optional[_T]]: The documents, in the order of the keys.
+        """
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _schedule(self) -> None:
+        keys, self._pending = self._pending, []
+        # Keep a reference, the event loop only holds weak ones to its tasks
+        task = asyncio.ensure_future(self._dispatch(keys))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, keys: List[Any]) -> None:
+        try:
+            # NOTE Raising, a database error must not resolve the keys as not found
+            documents = await self.repository._find_many(keys, self.key, self.projection, self.view)
+        except Exception as e:
+            # Failed keys are dropped, so a later `load` fetches them again
+            for key in keys:
+                future = self._futures.pop(key)
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key in keys:
+            future = self._futures[key]
+            if not future.done():
+                future.set_result(documents.get(key))
+
+
+def loader_dependency(repository: AsyncBaseRepository, key: str = '_id', projection: Optional[dict] = None,
+                      view: Optional[Type[BaseModel]] = None) -> Callable[[], RepositoryLoader]:
+    """
+    Builds a FastAPI dependency giving each request its own loader.
+    FastAPI caches dependencies per request, so every dependant of a request shares the loader.
+
+    Usage:
+        users_loader = loader_dependency(users_repository)
+
+        async def route(loader: RepositoryLoader = Depends(users_loader)):
+            ...
+    """
+    def dependency() -> RepositoryLoader:
+        return RepositoryLoader(repository, key=key, projection=projection, view=view)
+
+    return dependency
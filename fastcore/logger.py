@@ -1,4 +1,18 @@
+import copy
 import logging
+import os
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from queue import Empty, Full, Queue
+from typing import Dict, Literal, Optional
+
+import orjson
+
+DROP_POLICIES = Literal['drop_new', 'drop_oldest']
+
+# The id of the request being handled, set by the `RequestIdMiddleware`
+request_id_var: ContextVar[Optional[str]] = ContextVar('request_id', default=None)
 
 
 class ColorfulFormatter(logging.Formatter):
@@ -15,29 +29,272 @@ class ColorfulFormatter(logging.Formatter):
 
     RESET = '\033[0m'
 
-    def __init__(self, app_name: str):
+    def __init__(self, app_name: Optional[str] = None):
         super().__init__()
+        # NOTE Without an app name, the logger name is used, so one formatter serves every logger
         self.app_name = app_name
 
     def format(self, record):
         color = self.COLORS.get(record.levelname, self.RESET)
-        message = f"{color}[{self.app_name}] {record.levelname}{self.RESET}: {record.msg}"  # noqa
+        # NOTE `getMessage` applies the lazy `%` args, only for the records that are emitted
+        message = f"{color}[{self.app_name or record.name}] {record.levelname}{self.RESET}: {record.getMessage()}"  # noqa
+        request_id = getattr(record, 'request_id', None)
+        if request_id:
+            message = f'{message} [{request_id}]'
+        if record.exc_info:
+            message = f'{message}\n{self.formatException(record.exc_info)}'
+        elif record.exc_text:
+            message = f'{message}\n{record.exc_text}'
         return f'{message}'
 
 
+class JsonFormatter(logging.Formatter):
+    """
+    Formats the records as one JSON object per line, for log pipelines to ingest without parsing.
+    """
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        request_id = getattr(record, 'request_id', None)
+        if request_id:
+            entry['request_id'] = request_id
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return orjson.dumps(entry, default=str).decode('utf-8')
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Adds the current request id to the records.
+    It runs on the emitting thread, where the context variable is set, before any queueing.
+    """
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+def make_formatter() -> logging.Formatter:
+    """
+    The formatter selected by the `LOG_FORMAT` env, `json` or `color` (the default).
+    """
+    log_format = os.getenv('LOG_FORMAT', 'color').lower()
+    if log_format == 'json':
+        return JsonFormatter()
+    if log_format == 'color':
+        return ColorfulFormatter()
+    raise ValueError(f"Invalid log format: {log_format}")
+
+
+_exception_formatter = logging.Formatter()
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    A QueueHandler that never blocks the caller.
+    When the queue is full, records are dropped according to the policy, and counted.
+    """
+
+    def __init__(self, queue: Queue, policy: DROP_POLICIES = 'drop_new'):
+        super().__init__(queue)
+        self.policy = policy
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # NOTE The args are applied here, since they may change once queued,
+        # but the traceback is kept apart from the message for the formatters
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            return
+        except Full:
+            pass
+        if self.policy == 'drop_oldest':
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+            except (Empty, Full):
+                pass
+        self.dropped += 1
+
+
+class _Listener(QueueListener):
+
+    def enqueue_sentinel(self) -> None:
+        # NOTE Blocks on a full queue, the listener is still draining it
+        self.queue.put(self._sentinel)
+
+
+class LoggingPipeline:
+    """
+    Moves the log writes off the calling thread, usually the event loop.
+    Loggers enqueue their records, and a single background listener writes them to stderr.
+    """
+
+    def __init__(self, maxsize: int = 10_000, policy: DROP_POLICIES = 'drop_new',
+                 handler: Optional[logging.Handler] = None):
+        """
+        Args:
+            maxsize (int, optional): Maximum records buffered. Defaults to 10000.
+            policy (DROP_POLICIES, optional): What to drop when the buffer is full. Defaults to 'drop_new'.
+            handler (logging.Handler, optional): The writer. Defaults to a colorful `StreamHandler`.
+        """
+        self.queue: Queue = Queue(maxsize)
+        self.handler = BoundedQueueHandler(self.queue, policy)
+        self.handler.addFilter(RequestIdFilter())
+        if handler is None:
+            handler = logging.StreamHandler()
+            handler.setFormatter(make_formatter())
+        self.writer = handler
+        self.listener = _Listener(self.queue, self.writer, respect_handler_level=True)
+
+    @property
+    def dropped(self) -> int:
+        return self.handler.dropped
+
+    def start(self) -> None:
+        self.listener.start()
+
+    def stop(self) -> None:
+        """
+        Stops the listener, after writing the buffered records.
+        """
+        self.listener.stop()
+
+
+LEVELS = {
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARNING': logging.WARNING,
+    'ERROR': logging.ERROR,
+    'CRITICAL': logging.CRITICAL,
+}
+
+# The loggers configured by `setup_logger`, by name
+_loggers: Dict[str, logging.Logger] = {}
+# The level of each logger, before overrides
+_debug: Dict[str, bool] = {}
+# Per-module level overrides, by logger name prefix
+_overrides: Optional[Dict[str, int]] = None
+_stream: Optional[logging.Handler] = None
+_pipeline: Optional[LoggingPipeline] = None
+
+
+def _shared_handler() -> logging.Handler:
+    """
+    The handler shared by every logger, the pipeline one when it runs.
+    """
+    global _stream
+    if _pipeline is not None:
+        return _pipeline.handler
+    if _stream is None:
+        _stream = logging.StreamHandler()
+        _stream.setFormatter(make_formatter())
+        _stream.addFilter(RequestIdFilter())
+    return _stream
+
+
+def parse_levels(value: str) -> Dict[str, int]:
+    """
+    Parses level overrides, as in `LOG_LEVELS=AsyncBaseRepository=WARNING,AuthJwt=ERROR`.
+    """
+    overrides = {}
+    for item in filter(None, (part.strip() for part in value.split(','))):
+        name, _, level = item.rpartition('=')
+        if not name or level.upper() not in LEVELS:
+            raise ValueError(f"Invalid log level override: {item}")
+        overrides[name.strip()] = LEVELS[level.upper()]
+    return overrides
+
+
+def _level(app_name: str) -> int:
+    global _overrides
+    if _overrides is None:
+        _overrides = parse_levels(os.getenv('LOG_LEVELS', ''))
+    # NOTE The longest matching prefix wins, so `AsyncBaseRepository` covers every collection
+    matches = [name for name in _overrides if app_name.startswith(name)]
+    if matches:
+        return _overrides[max(matches, key=len)]
+    return logging.DEBUG if _debug.get(app_name, True) is not False else logging.ERROR
+
+
+def configure_levels(overrides: Dict[str, str]) -> None:
+    """
+    Sets per-module level overrides, by logger name prefix, e.g. from the settings.
+    They apply to the loggers already configured, and to the next ones.
+    """
+    global _overrides
+    _overrides = {name: LEVELS[level.upper()] for name, level in overrides.items()}
+    for name, logger in _loggers.items():
+        logger.setLevel(_level(name))
+
+
 def setup_logger(app_name: str, debug: bool = True):
     """
-    This function sets up the logger for the application
+    This function sets up the logger for the application.
+    Each name is configured once, later calls return the same logger, so no handler is duplicated.
     """
+    logger = _loggers.get(app_name)
+    if logger is not None:
+        return logger
+
     logger = logging.getLogger(app_name)
-    logger.setLevel(logging.DEBUG)
+    _debug[app_name] = debug
+    # NOTE The level is set on the logger, so it holds whichever handler is attached
+    logger.setLevel(_level(app_name))
+    logger.addHandler(_shared_handler())
+    _loggers[app_name] = logger
+    return logger
 
-    handler = logging.StreamHandler()
-    formatter = ColorfulFormatter(app_name)
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
 
-    if debug is False:
-        handler.setLevel(logging.ERROR)
+def _swap_handlers(previous: logging.Handler, handler: logging.Handler) -> None:
+    for logger in _loggers.values():
+        logger.removeHandler(previous)
+        logger.addHandler(handler)
 
-    return logger
+
+def start_logging_pipeline(maxsize: int = None, policy: DROP_POLICIES = None) -> LoggingPipeline:
+    """
+    Routes every fastcore logger through a `LoggingPipeline`, started once from the `ClientLifespan`.
+    The buffer size and drop policy default to the `LOG_QUEUE_SIZE` and `LOG_DROP_POLICY` envs.
+    """
+    global _pipeline
+    if _pipeline is not None:
+        return _pipeline
+    previous = _shared_handler()
+    _pipeline = LoggingPipeline(
+        maxsize=maxsize or int(os.getenv('LOG_QUEUE_SIZE', 10_000)),
+        policy=policy or os.getenv('LOG_DROP_POLICY', 'drop_new'),
+    )
+    _pipeline.start()
+    _swap_handlers(previous, _pipeline.handler)
+    return _pipeline
+
+
+def stop_logging_pipeline() -> None:
+    """
+    Flushes the pipeline, and restores direct writes.
+    """
+    global _pipeline
+    if _pipeline is None:
+        return
+    pipeline, _pipeline = _pipeline, None
+    _swap_handlers(pipeline.handler, _shared_handler())
+    pipeline.stop()
+    if pipeline.dropped:
+        logging.getLogger(__name__).warning('%s log records were dropped', pipeline.dropped)
@@ -1,12 +1,11 @@
-from typing import Type
-from fastapi.requests import HTTPConnection
+from typing import Optional, Type
+from fastapi.requests import HTTPConnection, Request
 from starlette.middleware.authentication import AuthenticationMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.authentication import AuthenticationBackend
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from fastcore.auth.current_user import get_current_user, get_token_user
-from fastcore.abstract.abstract_user import TUser
-from fastcore.request import UserRequest
+from fastcore.auth.current_user import get_token_user
+from fastcore.abstract.abstract_user import TUser, AbstractUser
 from fastcore.logger import setup_logger
 
 from logging import Logger
@@ -23,7 +22,7 @@ async def authenticate(self, conn: HTTPConnection):
     if scheme.lower() != "bearer":
         return
 
-    return await get_token_user(token)
+    return await get_token_user(token, client=getattr(conn.scope.get('app'), 'client', None))
 
 
 class AuthJwt(AuthenticationBackend):
@@ -34,7 +33,7 @@ class AuthJwt(AuthenticationBackend):
         if not token:
             return None, None
 
-        return await get_token_user(token)
+        return await get_token_user(token, client=getattr(conn.scope.get('app'), 'client', None))
 
 
 class AuthInjectUserMiddleware(AuthenticationMiddleware):
@@ -48,15 +47,70 @@ class AuthInjectUserMiddleware(AuthenticationMiddleware):
         self.backend.logger = self.logger
 
 
-class BaseInjectUserMiddleware(BaseHTTPMiddleware):
+class LazyUser:
+    """
+    The user of a connection, only looked up when first awaited, with the client of the app.
+    Routes that never await it do not pay for the token decoding nor the database lookup.
+    Once resolved, the user, or None, is also set as `request.state.user`.
+
+    Usage:
+        user = await request.get_user()  # in a `UserRoute`, the default of `CustomClientApp`
+        user = Depends(get_request_user)
+    """
+
+    def __init__(self, scope: Scope, user_model: Type[TUser]):
+        self._scope = scope
+        self._user_model = user_model
+        self._resolved = False
+        self._user: Optional[TUser] = None
+
+    async def resolve(self) -> Optional[TUser]:
+        if not self._resolved:
+            token = HTTPConnection(self._scope).cookies.get("access_token")
+            # NOTE Without an app client, e.g. under a bare ASGI app, `get_token_user` uses the `get_settings` one
+            client = getattr(self._scope.get("app"), "client", None)
+            _, self._user = await get_token_user(token, self._user_model, client)
+            self._resolved = True
+            self._scope["state"]["user"] = self._user
+        return self._user
+
+    @property
+    def resolved(self) -> bool:
+        return self._resolved
+
+    def __await__(self):
+        return self.resolve().__await__()
+
+    def __bool__(self):
+        # NOTE Always truthy otherwise, `if user:` would pass for anonymous requests
+        raise TypeError('A LazyUser must be awaited before use, e.g. `await request.get_user()`')
+
+    def __getattr__(self, name: str):
+        raise AttributeError(f"'LazyUser' has no attribute '{name}', await it first, e.g. `await request.get_user()`")
+
+
+class BaseInjectUserMiddleware:
+    """
+    A pure ASGI middleware injecting a `LazyUser` into `scope["state"]["lazy_user"]`.
+    Unlike `BaseHTTPMiddleware`, it adds no task group nor response wrapping to the requests.
+    """
+
+    def __init__(self, app: ASGIApp, user_model: Type[TUser] = AbstractUser):
+        self.app = app
+        self.user_model = user_model
+        self.logger = setup_logger(__class__.__name__)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] in ("http", "websocket"):
+            scope.setdefault("state", {})["lazy_user"] = LazyUser(scope, self.user_model)
+        await self.app(scope, receive, send)
 
-    def __init__(self, app, *args, **kwargs):
-        super().__init__(app, *args, **kwargs)
 
-    async def dispatch(self, request: UserRequest, call_next):
-        # Pass the specific user model to the generic `get_current_user` function
-        user = await get_current_user(request, self.user_model)
-        request.state.user = user
-        response = await call_next(request)
-        self.logger.info('Dispatching')
-        return response
+async def get_request_user(request: Request) -> Optional[AbstractUser]:
+    """
+    A FastAPI dependency resolving the user injected by `BaseInjectUserMiddleware`.
+    """
+    lazy_user = getattr(request.state, "lazy_user", None)
+    if lazy_user is not None:
+        return await lazy_user
+    return getattr(request.state, "user", None)
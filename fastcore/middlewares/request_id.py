@@ -0,0 +1,45 @@
+from uuid import uuid4
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from fastcore.logger import request_id_var
+
+REQUEST_ID_HEADER = 'x-request-id'
+
+
+class RequestIdMiddleware:
+    """
+    A pure ASGI middleware giving each request an id, propagated to the logs through `request_id_var`.
+    The incoming `X-Request-ID` header is reused, and the id is echoed in the response headers.
+    Add it last, so it wraps every other middleware.
+    """
+
+    def __init__(self, app: ASGIApp, header: str = REQUEST_ID_HEADER):
+        self.app = app
+        self.header = header.lower()
+        self._raw_header = self.header.encode('latin-1')
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] not in ('http', 'websocket'):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope['headers']:
+            if name == self._raw_header:
+                request_id = value.decode('latin-1')[:128]
+                break
+        request_id = request_id or uuid4().hex
+        scope.setdefault('state', {})['request_id'] = request_id
+
+        async def send_with_id(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                MutableHeaders(scope=message).setdefault(self.header, request_id)
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id_var.reset(token)
@@ -0,0 +1,112 @@
+import os
+from typing import Any, Callable, Dict, Optional
+
+from fastcore.abstract.abstract_settings import AbstractSettings
+
+# Presets for the connection pool, the envs and explicit arguments take precedence
+PRESETS: Dict[str, Dict[str, Any]] = {
+    'default': {},
+    'development': {
+        'max_pool_size': 10,
+        'server_selection_timeout_ms': 5_000,
+    },
+    'production': {
+        'max_pool_size': 100,
+        'min_pool_size': 10,
+        'max_idle_time_ms': 60_000,
+        'wait_queue_timeout_ms': 2_000,
+        'connect_timeout_ms': 5_000,
+        'server_selection_timeout_ms': 5_000,
+        'compressors': 'zlib',
+        'retry_writes': True,
+        'retry_reads': True,
+    },
+}
+
+# The client option, and the env, of each setting
+_OPTIONS: Dict[str, tuple] = {
+    'max_pool_size': ('maxPoolSize', 'MONGO_MAX_POOL_SIZE', int),
+    'min_pool_size': ('minPoolSize', 'MONGO_MIN_POOL_SIZE', int),
+    'max_idle_time_ms': ('maxIdleTimeMS', 'MONGO_MAX_IDLE_TIME_MS', int),
+    'wait_queue_timeout_ms': ('waitQueueTimeoutMS', 'MONGO_WAIT_QUEUE_TIMEOUT_MS', int),
+    'connect_timeout_ms': ('connectTimeoutMS', 'MONGO_CONNECT_TIMEOUT_MS', int),
+    'server_selection_timeout_ms': ('serverSelectionTimeoutMS', 'MONGO_SERVER_SELECTION_TIMEOUT_MS', int),
+    'socket_timeout_ms': ('socketTimeoutMS', 'MONGO_SOCKET_TIMEOUT_MS', int),
+    'compressors': ('compressors', 'MONGO_COMPRESSORS', str),
+    'retry_writes': ('retryWrites', 'MONGO_RETRY_WRITES', lambda value: value.lower() in ('1', 'true')),
+    'retry_reads': ('retryReads', 'MONGO_RETRY_READS', lambda value: value.lower() in ('1', 'true')),
+    'app_name': ('appname', 'MONGO_APP_NAME', str),
+}
+
+
+class MongoSettings(AbstractSettings):
+    """
+    The connection pool and timeout options of the MongoDB clients.
+    Unset options keep the driver defaults.
+    The values come from a preset, overridden by the `MONGO_*` envs, overridden by the arguments.
+
+    Usage:
+        settings = MongoSettings.production(max_pool_size=50)
+        client = get_async_mongo_client(debug=False, settings=settings)
+    """
+    max_pool_size: Optional[int] = None
+    min_pool_size: Optional[int] = None
+    max_idle_time_ms: Optional[int] = None
+    wait_queue_timeout_ms: Optional[int] = None
+    connect_timeout_ms: Optional[int] = None
+    server_selection_timeout_ms: Optional[int] = None
+    socket_timeout_ms: Optional[int] = None
+    compressors: Optional[str] = None
+    retry_writes: Optional[bool] = None
+    retry_reads: Optional[bool] = None
+    app_name: Optional[str] = None
+
+    def __init__(self, preset: Optional[str] = None, **overrides) -> None:
+        """
+        Args:
+            preset (str, optional): One of `PRESETS`. Defaults to the `MONGO_PRESET` env, or 'default'.
+            **overrides: Explicit values, by setting name.
+        """
+        super().__init__()
+        self.preset = preset or os.getenv('MONGO_PRESET', 'default')
+        if self.preset not in PRESETS:
+            raise ValueError(f"Invalid MongoDB settings preset: {self.preset}")
+        unknown = set(overrides) - set(_OPTIONS)
+        if unknown:
+            raise ValueError(f"Invalid MongoDB settings: {sorted(unknown)}")
+        self.load_settings()
+        for name, value in overrides.items():
+            setattr(self, name, value)
+
+    def load_settings(self):
+        for name, value in PRESETS[self.preset].items():
+            setattr(self, name, value)
+        for name, (_, env, cast) in _OPTIONS.items():
+            value = os.getenv(env)
+            if value:
+                setattr(self, name, self._cast(env, cast, value))
+
+    @staticmethod
+    def _cast(env: str, cast: Callable[[str], Any], value: str) -> Any:
+        try:
+            return cast(value)
+        except ValueError:
+            raise ValueError(f"Invalid value for {env}: {value}")
+
+    @classmethod
+    def development(cls, **overrides) -> 'MongoSettings':
+        return cls('development', **overrides)
+
+    @classmethod
+    def production(cls, **overrides) -> 'MongoSettings':
+        return cls('production', **overrides)
+
+    def client_kwargs(self) -> Dict[str, Any]:
+        """
+        The keyword arguments for `MongoClient`/`AsyncIOMotorClient`.
+        """
+        return {
+            option: getattr(self, name)
+            for name, (option, _, _) in _OPTIONS.items()
+            if getattr(self, name) is not None
+        }
@@ -0,0 +1,140 @@
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Optional
+
+from pymongo import monitoring
+
+# The driver default `maxPoolSize`
+DEFAULT_MAX_POOL_SIZE = 100
+
+
+class _PoolStats:
+
+    def __init__(self) -> None:
+        self.max_pool_size = DEFAULT_MAX_POOL_SIZE
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.created = 0
+        self.closed = 0
+        self.cleared = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'max_pool_size': self.max_pool_size,
+            'checked_out': self.checked_out,
+            'max_checked_out': self.max_checked_out,
+            'saturation': self.checked_out / self.max_pool_size if self.max_pool_size else 0.0,
+            'checkouts': self.checkouts,
+            'checkout_failures': self.checkout_failures,
+            'checkout_wait_avg_ms': 1000 * self.wait_total / self.checkouts if self.checkouts else 0.0,
+            'checkout_wait_max_ms': 1000 * self.wait_max,
+            'connections_created': self.created,
+            'connections_closed': self.closed,
+            'pool_cleared': self.cleared,
+        }
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """
+    Collects the connection pool metrics of one client, per server: checkout wait times, saturation
+    and connection churn. The events do not tell the client apart, so each client needs its own listener.
+    The driver calls it from its own threads, so the counters are guarded by a lock.
+
+    Usage:
+        metrics = PoolMetrics()
+        MongoClient(uri, event_listeners=[metrics])
+        metrics.snapshot()
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pools: Dict[str, _PoolStats] = defaultdict(_PoolStats)
+        # Checkout start times, by server and thread, for drivers not reporting the duration
+        self._started: Dict[tuple, float] = {}
+
+    @staticmethod
+    def _key(address) -> str:
+        return f'{address[0]}:{address[1]}' if isinstance(address, tuple) else str(address)
+
+    def _wait(self, event) -> float:
+        started = self._started.pop((event.address, threading.get_ident()), None)
+        duration = getattr(event, 'duration', None)
+        if duration is not None:
+            return duration
+        return time.perf_counter() - started if started is not None else 0.0
+
+    def pool_created(self, event):
+        with self._lock:
+            self._pools[self._key(event.address)].max_pool_size = event.options.get('maxPoolSize', DEFAULT_MAX_POOL_SIZE)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self._pools[self._key(event.address)].cleared += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self._pools[self._key(event.address)].created += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self._pools[self._key(event.address)].closed += 1
+
+    def connection_check_out_started(self, event):
+        with self._lock:
+            self._started[(event.address, threading.get_ident())] = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self._wait(event)
+            self._pools[self._key(event.address)].checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            wait = self._wait(event)
+            stats = self._pools[self._key(event.address)]
+            stats.checkouts += 1
+            stats.wait_total += wait
+            stats.wait_max = max(stats.wait_max, wait)
+            stats.checked_out += 1
+            stats.max_checked_out = max(stats.max_checked_out, stats.checked_out)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            stats = self._pools[self._key(event.address)]
+            stats.checked_out = max(stats.checked_out - 1, 0)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        The metrics of each server pool, by `host:port`.
+        """
+        with self._lock:
+            return {address: stats.snapshot() for address, stats in self._pools.items()}
+
+    def saturation(self) -> float:
+        """
+        The highest saturation, checked out over max connections, among the pools.
+        """
+        with self._lock:
+            return max((stats.checked_out / stats.max_pool_size for stats in self._pools.values() if stats.max_pool_size), default=0.0)
+
+
+def pool_metrics_of(client: Any) -> Optional[PoolMetrics]:
+    """
+    The metrics of a client made by `fastcore.mongo_client`, or None for other clients.
+    """
+    # NOTE Read from the instance, as Motor turns unknown attributes into databases
+    return getattr(client, '__dict__', {}).get('pool_metrics')
@@ -0,0 +1,159 @@
+import base64
+import binascii
+from typing import Any, Callable, Generic, List, Optional, TypeVar
+
+from bson import json_util
+from bson.errors import BSONError
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+from pymongo import ASCENDING
+
+_T = TypeVar('_T')
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class InvalidPageToken(HTTPException, ValueError):
+    """
+    A malformed or foreign continuation token.
+    A `ValueError`, and a 400 `HTTPException`, so routes passing `?after=` through answer a 400.
+    """
+
+    def __init__(self, detail: str = 'Invalid page token'):
+        super().__init__(status_code=400, detail=detail)
+
+
+class Page(BaseModel, Generic[_T]):
+    """
+    A page of documents, and the opaque token to fetch the next one.
+    """
+    items: List[_T]
+    next: Optional[str] = None
+
+
+def _get_value(document: dict, key: str) -> Any:
+    """
+    Reads a, possibly dotted, key from a raw document.
+    """
+    value = document
+    for part in key.split('.'):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+
+def encode_token(sort_key: str, document: dict) -> str:
+    """
+    Builds the continuation token from the last document of a page.
+    The token holds the sort key value and the `_id`, so ties on the sort key are handled.
+    """
+    values = [_get_value(document, sort_key), document.get('_id')]
+    payload = json_util.dumps({'k': sort_key, 'v': values}).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+
+def decode_token(sort_key: str, token: str) -> list:
+    """
+    Decodes a continuation token.
+
+    Raises:
+        InvalidPageToken: If the token is malformed or was issued for another sort key.
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json_util.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError, binascii.Error, BSONError) as e:
+        raise InvalidPageToken(f'Invalid page token: {e}')
+    if not isinstance(payload, dict) or payload.get('k') != sort_key:
+        raise InvalidPageToken()
+    if not isinstance(payload.get('v'), list) or len(payload['v']) != 2:
+        raise InvalidPageToken()
+    return payload['v']
+
+
+def keyset_query(filter: dict, sort_key: str, direction: int, after: Optional[str]) -> dict:
+    """
+    Combines the filter with the keyset condition, so the page starts right after the token.
+    Null and missing sort values sort first in MongoDB, and no comparison with null matches,
+    so they get explicit conditions.
+    """
+    if not after:
+        return filter
+    value, last_id = decode_token(sort_key, after)
+    op = '$gt' if direction == ASCENDING else '$lt'
+    if sort_key == '_id':
+        condition = {'_id': {op: last_id}}
+    else:
+        # NOTE `$eq` keeps a value decoded from the token from being read as an operator
+        ties = {sort_key: {'$eq': value}, '_id': {op: last_id}}
+        if value is None:
+            # After a null, ascending goes on with the ties then every non-null value, descending only has ties left
+            after_value = [{sort_key: {'$ne': None}}] if direction == ASCENDING else []
+        else:
+            # Descending ends with the nulls, past every non-null value
+            after_value = [{sort_key: {op: value}}] + ([] if direction == ASCENDING else [{sort_key: {'$eq': None}}])
+        condition = {'$or': [*after_value, ties]}
+    return {'$and': [filter, condition]} if filter else condition
+
+
+def keyset_sort(sort_key: str, direction: int) -> list:
+    """
+    The sort specification, with `_id` as tie breaker.
+    An index on `(sort_key, _id)` makes every page cost the same.
+    """
+    if sort_key == '_id':
+        return [('_id', direction)]
+    return [(sort_key, direction), ('_id', direction)]
+
+
+def build_page(documents: List[dict], limit: int, sort_key: str, hydrate: Callable[[List[dict]], List[_T]]) -> Page[_T]:
+    """
+    Builds the page from `limit + 1` fetched documents, the extra one only signals a next page.
+    """
+    items = documents[:limit]
+    token = encode_token(sort_key, items[-1]) if len(documents) > limit else None
+    return Page(items=hydrate(items), next=token)
+
+
+class PageParams:
+    """
+    A FastAPI dependency for the `?after=&limit=` query parameters.
+    An invalid `after` makes `paginate` raise an `InvalidPageToken`, answered with a 400.
+
+    Usage:
+        async def route(page: PageParams = Depends()):
+            return await repository.paginate(limit=page.limit, after=page.after)
+    """
+
+    def __init__(
+        self,
+        after: Optional[str] = Query(None, description='The token of the previous page.'),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description='The page size.'),
+    ):
+        self.after = after
+        self.limit = limit
+
+    def validate(self, sort_key: str = '_id') -> 'PageParams':
+        """
+        Checks the token against the sort key, raising a 400 if it is invalid.
+        Optional, `paginate` raises the same `InvalidPageToken` before querying.
+        """
+        if self.after:
+            decode_token(sort_key, self.after)
+        return self
+
+
+def keyset_projection(projection: Optional[dict], sort_key: str) -> Optional[dict]:
+    """
+    Makes sure the projection keeps the fields the continuation token is built from.
+    """
+    if projection is None:
+        return None
+    projection = dict(projection)
+    if any(value for key, value in projection.items() if key != '_id'):
+        projection[sort_key] = 1
+        projection['_id'] = 1
+    else:
+        projection.pop(sort_key, None)
+        projection.pop('_id', None)
+    return projection
@@ -0,0 +1,54 @@
+from functools import lru_cache
+from typing import Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+
+@lru_cache(maxsize=None)
+def _projection_for(model: Type[BaseModel]) -> Tuple[Tuple[str, int], ...]:
+    fields = {}
+    for name, field in model.model_fields.items():
+        key = field.validation_alias if isinstance(field.validation_alias, str) else field.alias
+        fields[key or name] = 1
+    if '_id' not in fields:
+        fields['_id'] = 0
+    return tuple(fields.items())
+
+
+def projection_for(model: Type[BaseModel]) -> dict:
+    """
+    Derives a MongoDB projection from the fields of a pydantic "view" model.
+    Aliases are respected, so `HasId.id` projects `_id`, which is excluded when the view has no id.
+
+    Args:
+        model (Type[BaseModel]): The view model.
+
+    Returns:
+        dict: The projection, only fetching the fields of the view.
+    """
+    return dict(_projection_for(model))
+
+
+def resolve_view(model: Type[BaseModel], projection: Optional[dict] = None,
+                 view: Optional[Type[BaseModel]] = None, hydrated: bool = True) -> Tuple[Optional[dict], Type[BaseModel]]:
+    """
+    Resolves the projection and the model to hydrate the documents with.
+
+    Args:
+        model (Type[BaseModel]): The repository model.
+        projection (dict, optional): An explicit projection, which takes precedence.
+        view (Type[BaseModel], optional): A partial model, used to derive the projection.
+        hydrated (bool, optional): Whether the documents are hydrated, False for raw reads. Defaults to True.
+
+    Returns:
+        Tuple[Optional[dict], Type[BaseModel]]: The projection, and the model to hydrate with.
+
+    Raises:
+        ValueError: If hydrated documents get a projection without a `view`, as the partial documents
+            would fail the validation of the full model.
+    """
+    if view is None:
+        if projection is not None and hydrated:
+            raise ValueError('A projection needs a `view` model to hydrate the partial documents with')
+        return projection, model
+    return (projection if projection is not None else projection_for(view)), view
@@ -1,19 +1,81 @@
 from abc import ABC, abstractmethod
+from bson import json_util
+from bson.json_util import CANONICAL_JSON_OPTIONS
+from bson.raw_bson import RawBSONDocument
 from pydantic import BaseModel
-from pymongo.errors import PyMongoError
+from pymongo import ASCENDING
+from pymongo.errors import BulkWriteError, PyMongoError
 from pymongo.results import InsertOneResult
-from typing import TypeVar, Generic, List, Optional
+from typing import Any, AsyncIterator, ClassVar, Dict, Iterable, TypeVar, Generic, List, Optional, Type
 
+from .cache import CacheBackend, MemoryCacheBackend
+from .bulk import BulkOperation, BulkWriteReport, chunked, max_write_batch_size
+from .diagnostics import QueryPlanGuard
+from .hydration import Hydration, hydrate, hydrate_many
+from .indexes import IndexSpec, index_registry
 from .logger import setup_logger
+from .serialization import RAW_CODEC_OPTIONS
+from .pagination import Page, build_page, keyset_projection, keyset_query, keyset_sort
+from .projection import resolve_view
 from .types import CLIENTS, DATABASES, COLLECTIONS
 
 _T = TypeVar('_T', bound=BaseModel)
 
 
+# Collections already warned about, by `_check_indexes_declared`
+_warned_undeclared = set()
+
+
+def _declared_indexes(repository, model: Optional[Type[BaseModel]]) -> List[IndexSpec]:
+    model_indexes = getattr(model, 'model_config', {}).get('indexes', []) if model is not None else []
+    return [*repository.indexes, *model_indexes]
+
+
 class AbstractRepository(ABC, Generic[_T]):
     """
     Abstract base class for repository pattern. Defines the standard CRUD operations.
     """
+    indexes: ClassVar[List[IndexSpec]] = []
+    # Opt-in sampling of the query plans, see `fastcore.diagnostics`
+    plan_guard: ClassVar[Optional[QueryPlanGuard]] = None
+    # How documents are turned into models, see `fastcore.hydration`
+    hydration: Hydration = Hydration.validate
+
+    def _hydrate(self, document: dict, model: Type[BaseModel]) -> _T:
+        return hydrate(model, document, self.hydration)
+
+    def _hydrate_many(self, documents: List[dict], model: Type[BaseModel]) -> List[_T]:
+        return hydrate_many(model, documents, self.hydration)
+
+    @classmethod
+    def declare_indexes(cls, database_name: str, collection_name: str, model: Optional[Type[BaseModel]] = None) -> None:
+        """
+        Registers the indexes declared by the repository and its model, to be synced on startup.
+        Call it at import, next to the repository: repositories built per request only exist
+        after the `ClientLifespan` has synced the indexes.
+
+        Usage:
+            ItemRepository.declare_indexes('shop', 'items', Item)
+
+        Args:
+            database_name (str): Name of the database.
+            collection_name (str): Name of the collection.
+            model (Type[BaseModel], optional): The model, for its `model_config['indexes']`. Defaults to the class `model` attribute.
+        """
+        specs = _declared_indexes(cls, model if model is not None else getattr(cls, 'model', None))
+        if specs:
+            index_registry.register(database_name, collection_name, specs)
+
+    def _check_indexes_declared(self, database_name: str, collection_name: str) -> None:
+        """
+        Warns, once per collection, about indexes only known once the repository is built.
+        """
+        specs = _declared_indexes(self, getattr(self, 'model', None))
+        undeclared = index_registry.undeclared(database_name, collection_name, specs)
+        if undeclared and (database_name, collection_name) not in _warned_undeclared:
+            _warned_undeclared.add((database_name, collection_name))
+            self.logger.warning('Indexes %s of %s.%s are not synced on startup, call %s.declare_indexes at import',
+                                [spec.index_name for spec in undeclared], database_name, collection_name, self.__class__.__name__)
 
     @abstractmethod
     def create(self, data: dict) -> Optional[str]:
@@ -29,12 +91,14 @@ class AbstractRepository(ABC, Generic[_T]):
         pass
 
     @abstractmethod
-    def read(self, query: dict) -> Optional[_T]:
+    def read(self, query: dict, projection: Optional[dict] = None, view: Optional[Type[BaseModel]] = None) -> Optional[_T]:
         """
         Read a document from the collection.
 
         Args:
             query (dict): Query to find the document.
+            projection (dict, optional): Fields to fetch, requires a `view`. Defaults to the whole document, or to the `view` fields.
+            view (Type[BaseModel], optional): A partial model to hydrate the documents with. Defaults to `self.model`.
 
         Returns:
             Optional[_T]: The document if found, or None if not found.
@@ -69,12 +133,14 @@ class AbstractRepository(ABC, Generic[_T]):
         pass
 
     @abstractmethod
-    def list(self, filter: dict = {}) -> List[_T]:
+    def list(self, filter: dict = {}, projection: Optional[dict] = None, view: Optional[Type[BaseModel]] = None) -> List[_T]:
         """
         List documents in the collection.
 
         Args:
             filter (dict, optional): Filter to apply to the documents. Defaults to {}.
+            projection (dict, optional): Fields to fetch, requires a `view`. Defaults to the whole document, or to the `view` fields.
+            view (Type[BaseModel], optional): A partial model to hydrate the documents with. Defaults to `self.model`.
 
         Returns:
             List[_T]: List of documents matching the filter.
@@ -85,9 +151,11 @@ class AbstractRepository(ABC, Generic[_T]):
 class BaseRepository(AbstractRepository, Generic[_T]):
     """
     Base synchronous repository implementing common CRUD operations using PyMongo.
+    The indexes of the collection are declared on `indexes`, or on the model `model_config['indexes']`,
+    and registered at import with `declare_indexes`.
     """
 
-    def __init__(self, client: CLIENTS, database_name: str, collection_name: str):
+    def __init__(self, client: CLIENTS, database_name: str, collection_name: str, model: Optional[_T] = None):
         """
         Initialize the repository.
 
@@ -95,11 +163,24 @@ class BaseRepository(AbstractRepository, Generic[_T]):
             client (CLIENTS): MongoDB client instance.
             database_name (str): Name of the database.
             collection_name (str): Name of the collection.
+            model (_T, optional): Model used to hydrate the documents. Defaults to the class `model` attribute.
         """
         self.client = client
         self.database: DATABASES = client[database_name]
         self.collection: COLLECTIONS = self.database[collection_name]
         self.logger = setup_logger(self.__class__.__name__)
+        if model is not None:
+            self.model = model
+        self._check_indexes_declared(database_name, collection_name)
+
+    def _check_plan(self, query: dict, sort: Optional[list] = None, limit: Optional[int] = None) -> None:
+        # NOTE An empty filter scans the collection by design
+        if self.plan_guard is None or not query or not self.plan_guard.should_sample():
+            return
+        if self.plan_guard.raise_on_violation:
+            self.plan_guard.inspect(self.collection, query, sort, limit)
+        else:
+            self.plan_guard.inspect_later(self.collection, query, sort, limit)
 
     def create(self, data: dict) -> Optional[str]:
         """
@@ -115,25 +196,29 @@ class BaseRepository(AbstractRepository, Generic[_T]):
             result = self.collection.insert_one(data)
             return str(result.inserted_id)
         except PyMongoError as e:
-            self.logger.error(f"Failed to insert document: {e}")
+            self.logger.error("Failed to insert document: %s", e)
             return None
 
-    def read(self, query: dict) -> Optional[_T]:
+    def read(self, query: dict, projection: Optional[dict] = None, view: Optional[Type[BaseModel]] = None) -> Optional[_T]:
         """
         Read a document from the collection.
 
         Args:
             query (dict): Query to find the document.
+            projection (dict, optional): Fields to fetch, requires a `view`. Defaults to the whole document, or to the `view` fields.
+            view (Type[BaseModel], optional): A partial model to hydrate the documents with. Defaults to `self.model`.
 
         Returns:
             Optional[_T]: The document if found, or None if not found.
         """
         try:
-            document = self.collection.find_one(query)
+            projection, model = resolve_view(self.model, projection, view)
+            self._check_plan(query, limit=1)
+            document = self.collection.find_one(query, projection)
             if document:
-                return self.model(**document)
+                return self._hydrate(document, model)
         except PyMongoError as e:
-            self.logger.error(f"Failed to find document: {e}")
+            self.logger.error("Failed to find document: %s", e)
         return None
 
     def update(self, query: dict, data: dict) -> bool:
@@ -152,7 +237,7 @@ class BaseRepository(AbstractRepository, Generic[_T]):
             result = self.collection.update_one(query, updated_data)
             return result.modified_count > 0
         except PyMongoError as e:
-            self.logger.error(f"Failed to update document: {e}")
+            self.logger.error("Failed to update document: %s", e)
             return False
 
     def delete(self, query: dict) -> bool:
@@ -169,30 +254,99 @@ class BaseRepository(AbstractRepository, Generic[_T]):
             result = self.collection.delete_one(query)
             return result.deleted_count > 0
         except PyMongoError as e:
-            self.logger.error(f"Failed to delete document: {e}")
+            self.logger.error("Failed to delete document: %s", e)
             return False
 
-    def list(self, filter: dict = {}) -> List[_T]:
+    def list(self, filter: dict = {}, projection: Optional[dict] = None, view: Optional[Type[BaseModel]] = None) -> List[_T]:
         """
         List documents in the collection.
 
         Args:
             filter (dict, optional): Filter to apply to the documents. Defaults to {}.
+            projection (dict, optional): Fields to fetch, requires a `view`. Defaults to the whole document, or to the `view` fields.
+            view (Type[BaseModel], optional): A partial model to hydrate the documents with. Defaults to `self.model`.
 
         Returns:
             List[_T]: List of documents matching the filter.
         """
         try:
-            documents = self.collection.find(filter)
-            return [self.model(**doc) for doc in documents]
+            projection, model = resolve_view(self.model, projection, view)
+            self._check_plan(filter)
+            documents = self.collection.find(filter, projection)
+            return self._hydrate_many(list(documents), model)
         except PyMongoError as e:
-            self.logger.error(f"Failed to retrieve documents: {e}")
+            self.logger.error("Failed to retrieve documents: %s", e)
             return []
 
+    def paginate(self, filter: dict = {}, limit: int = 50, after: Optional[str] = None,
+                 sort_key: str = '_id', direction: int = ASCENDING,
+                 projection: Optional[dict] = None, view: Optional[Type[BaseModel]] = None) -> Page[_T]:
+        """
+        List one page of documents using keyset pagination.
+        Unlike `skip`, the cost of a page does not grow with its depth.
+
+        Args:
+            filter (dict, optional): Filter to apply to the documents. Defaults to {}.
+            limit (int, optional): Page size. Defaults to 50.
+            after (str, optional): The `next` token of the previous page. Defaults to None.
+            sort_key (str, optional): Indexed field to paginate on. Defaults to '_id'.
+            direction (int, optional): `ASCENDING` or `DESCENDING`. Defaults to ASCENDING.
+            projection (dict, optional): Fields to fetch, requires a `view`. Defaults to the whole document, or to the `view` fields.
+            view (Type[BaseModel], optional): A partial model to hydrate the documents with. Defaults to `self.model`.
+
+        Returns:
+            Page[_T]: The documents, and the token of the next page if there is one.
+
+        Raises:
+            InvalidPageToken: If the `after` token is invalid, a `ValueError` and a 400 `HTTPException`.
+        """
+        query = keyset_query(filter, sort_key, direction, after)
+        projection, model = resolve_view(self.model, projection, view)
+        try:
+            self._check_plan(query, keyset_sort(sort_key, direction), limit + 1)
+            cursor = self.collection.find(query, keyset_projection(projection, sort_key)).sort(keyset_sort(sort_key, direction)).limit(limit + 1)
+            return build_page(list(cursor), limit, sort_key, lambda documents: self._hydrate_many(documents, model))
+        except PyMongoError as e:
+            self.logger.error("Failed to retrieve documents: %s", e)
+            return Page(items=[])
+
+    def bulk_write(self, operations: Iterable[BulkOperation], ordered: bool = True,
+                   chunk_size: Optional[int] = None) -> BulkWriteReport:
+        """
+        Apply mixed insert/update/upsert/delete operations in as few round trips as possible.
+        The operations are sent in chunks of the server `maxWriteBatchSize`.
+
+        Args:
+            operations (Iterable[BulkOperation]): PyMongo write operations, see also `fastcore.bulk.update`/`upsert`.
+            ordered (bool, optional): Stop at the first error. Unordered writes let the server apply
+                the operations in parallel and keep going past errors. Defaults to True.
+            chunk_size (int, optional): Maximum operations per round trip. Defaults to the server limit.
+
+        Returns:
+            BulkWriteReport: The aggregated counts, upserted ids and per-operation errors.
+        """
+        report = BulkWriteReport()
+        offset = 0
+        for chunk in chunked(operations, chunk_size or max_write_batch_size(self.client)):
+            try:
+                report.add_result(self.collection.bulk_write(chunk, ordered=ordered), offset)
+            except BulkWriteError as e:
+                report.add_details(e.details, offset)
+                if ordered:
+                    break
+            except PyMongoError as e:
+                self.logger.error("Failed to bulk write documents: %s", e)
+                report.add_failure(offset, e)
+                break
+            offset += len(chunk)
+        return report
+
 
 class AsyncBaseRepository(AbstractRepository, Generic[_T]):
     """
     Base asynchronous repository implementing common CRUD operations using Motor.
+    The indexes of the collection are declared on `indexes`, or on the model `model_config['indexes']`,
+    and registered at import with `declare_indexes`.
     """
 
     def __init__(self, client: CLIENTS, database_name: str, collection_name: str, model: _T):
@@ -209,7 +363,17 @@ class AsyncBaseRepository(AbstractRepository, Generic[_T]):
         self.collection: COLLECTIONS = self.database[collection_name]
         self.logger = setup_logger(f'{self.__class__.__name__}({database_name}.{collection_name})')
         self.model = model
-        self.logger.info(f"Initialized repository for {database_name}.{collection_name}")
+        self._check_indexes_declared(database_name, collection_name)
+        self.logger.info("Initialized repository for %s.%s", database_name, collection_name)
+
+    async def _check_plan(self, query: dict, sort: Optional[list] = None, limit: Optional[int] = None) -> None:
+        # NOTE An empty filter scans the collection by design
+        if self.plan_guard is None or not query or not self.plan_guard.should_sample():
+            return
+        if self.plan_guard.raise_on_violation:
+            await self.plan_guard.inspect_async(self.collection, query, sort, limit)
+        else:
+            self.plan_guard.inspect_async_later(self.collection, query, sort, limit)
 
     async def create(self, data: dict) -> Optional[str]:
         """
@@ -225,27 +389,116 @@ class AsyncBaseRepository(AbstractRepository, Generic[_T]):
             result: InsertOneResult = await self.collection.insert_one(data)
             return str(result.inserted_id)
         except PyMongoError as e:
-            self.logger.error(f"Failed to insert document: {e}")
+            self.logger.error("Failed to insert document: %s", e)
             return None
 
-    async def read(self, query: dict) -> Optional[_T]:
+    async def read(self, query: dict, projection: Optional[dict] = None, view: Optional[Type[BaseModel]] = None) -> Optional[_T]:
         """
         Read a document from the collection.
 
         Args:
             query (dict): Query to find the document.
+            projection (dict, optional): Fields to fetch, requires a `view`. Defaults to the whole document, or to the `view` fields.
+            view (Type[BaseModel], optional): A partial model to hydrate the documents with. Defaults to `self.model`.
 
         Returns:
             Optional[_T]: The document if found, or None if not found.
         """
         try:
-            document = await self.collection.find_one(query)
-            if document is not None:
-                return self.model(**document)
+            return await self._find_one(query, projection, view)
+        except PyMongoError as e:
+            self.logger.error("Failed to find document: %s", e)
+        return None
+
+    async def _find_one(self, query: dict, projection: Optional[dict], view: Optional[Type[BaseModel]]) -> Optional[_T]:
+        """
+        `read`, raising the `PyMongoError`s.
+        """
+        projection, model = resolve_view(self.model, projection, view)
+        await self._check_plan(query, limit=1)
+        document = await self.collection.find_one(query, projection)
+        return self._hydrate(document, model) if document is not None else None
+
+    async def read_many(self, keys: Iterable[Any], key: str = '_id', projection: Optional[dict] = None,
+                        view: Optional[Type[BaseModel]] = None) -> Dict[Any, _T]:
+        """
+        Read the documents matching any of the keys, in a single `$in` query.
+
+        Args:
+            keys (Iterable[Any]): Values of the key to look for.
+            key (str, optional): A unique field to match the keys against. Defaults to '_id'.
+            projection (dict, optional): Fields to fetch, requires a `view`. Defaults to the whole document, or to the `view` fields.
+            view (Type[BaseModel], optional): A partial model to hydrate the documents with. Defaults to `self.model`.
+
+        Returns:
+            Dict[Any, _T]: The documents found, by key. Missing keys are left out.
+        """
+        try:
+            return await self._find_many(keys, key, projection, view)
         except PyMongoError as e:
-            self.logger.error(f"Failed to find document: {e}")
+            self.logger.error("Failed to find documents: %s", e)
+            return {}
+
+    async def _find_many(self, keys: Iterable[Any], key: str, projection: Optional[dict],
+                         view: Optional[Type[BaseModel]]) -> Dict[Any, _T]:
+        """
+        `read_many`, raising the `PyMongoError`s.
+        """
+        projection, model = resolve_view(self.model, projection, view)
+        projection = _with_key(projection, key)
+        query = {key: {'$in': list(keys)}}
+        await self._check_plan(query)
+        cursor = self.collection.find(query, projection)
+        documents = await cursor.to_list(length=None)
+        return dict(zip((doc.get(key) for doc in documents), self._hydrate_many(documents, model)))
+
+    async def read_raw(self, query: dict, projection: Optional[dict] = None,
+                       view: Optional[Type[BaseModel]] = None) -> Optional[RawBSONDocument]:
+        """
+        Read a document from the collection, as undecoded BSON.
+        Pair it with `fastcore.responses.RawBSONResponse` to skip the models and `jsonable_encoder`,
+        the documents are still decoded once, when rendered.
+
+        Args:
+            query (dict): Query to find the document.
+            projection (dict, optional): Fields to fetch. Defaults to the whole document, or to the `view` fields.
+            view (Type[BaseModel], optional): A partial model, only used to derive the projection.
+
+        Returns:
+            Optional[RawBSONDocument]: The document if found, or None if not found.
+        """
+        try:
+            projection, _ = resolve_view(self.model, projection, view, hydrated=False)
+            await self._check_plan(query, limit=1)
+            return await self.collection.with_options(codec_options=RAW_CODEC_OPTIONS).find_one(query, projection)
+        except PyMongoError as e:
+            self.logger.error("Failed to find document: %s", e)
         return None
 
+    async def list_raw(self, filter: dict = {}, projection: Optional[dict] = None,
+                       view: Optional[Type[BaseModel]] = None) -> List[RawBSONDocument]:
+        """
+        List documents in the collection, as undecoded BSON.
+        Pair it with `fastcore.responses.RawBSONResponse` to skip the models and `jsonable_encoder`,
+        the documents are still decoded once, when rendered.
+
+        Args:
+            filter (dict, optional): Filter to apply to the documents. Defaults to {}.
+            projection (dict, optional): Fields to fetch. Defaults to the whole document, or to the `view` fields.
+            view (Type[BaseModel], optional): A partial model, only used to derive the projection.
+
+        Returns:
+            List[RawBSONDocument]: List of documents matching the filter.
+        """
+        try:
+            projection, _ = resolve_view(self.model, projection, view, hydrated=False)
+            await self._check_plan(filter)
+            cursor = self.collection.with_options(codec_options=RAW_CODEC_OPTIONS).find(filter, projection)
+            return await cursor.to_list(length=None)
+        except PyMongoError as e:
+            self.logger.error("Failed to retrieve documents: %s", e)
+            return []
+
     async def update(self, query: dict, data: dict) -> bool:
         """
         Update a document in the collection.
@@ -263,7 +516,7 @@ class AsyncBaseRepository(AbstractRepository, Generic[_T]):
             self.logger.info('Document Updated')
             return result.modified_count > 0
         except PyMongoError as e:
-            self.logger.error(f"Failed to update document: {e}")
+            self.logger.error("Failed to update document: %s", e)
             return False
 
     async def delete(self, query: dict) -> bool:
@@ -280,27 +533,123 @@ class AsyncBaseRepository(AbstractRepository, Generic[_T]):
             result = await self.collection.delete_one(query)
             return result.deleted_count > 0
         except PyMongoError as e:
-            self.logger.error(f"Failed to delete document: {e}")
+            self.logger.error("Failed to delete document: %s", e)
             return False
 
-    async def list(self, filter: dict = {}) -> List[_T]:
+    async def list(self, filter: dict = {}, projection: Optional[dict] = None, view: Optional[Type[BaseModel]] = None) -> List[_T]:
         """
         List documents in the collection.
 
         Args:
             filter (dict, optional): Filter to apply to the documents. Defaults to {}.
+            projection (dict, optional): Fields to fetch, requires a `view`. Defaults to the whole document, or to the `view` fields.
+            view (Type[BaseModel], optional): A partial model to hydrate the documents with. Defaults to `self.model`.
 
         Returns:
             List[_T]: List of documents matching the filter.
         """
         try:
-            cursor = self.collection.find(filter)
-            documents = await cursor.to_list(length=None)
-            return [self.model(**doc) for doc in documents]
+            return await self._find(filter, projection, view)
         except PyMongoError as e:
-            self.logger.error(f"Failed to retrieve documents: {e}")
+            self.logger.error("Failed to retrieve documents: %s", e)
             return []
 
+    async def _find(self, filter: dict, projection: Optional[dict], view: Optional[Type[BaseModel]]) -> List[_T]:
+        """
+        `list`, raising the `PyMongoError`s.
+        """
+        projection, model = resolve_view(self.model, projection, view)
+        await self._check_plan(filter)
+        cursor = self.collection.find(filter, projection)
+        documents = await cursor.to_list(length=None)
+        return self._hydrate_many(documents, model)
+
+    async def paginate(self, filter: dict = {}, limit: int = 50, after: Optional[str] = None,
+                       sort_key: str = '_id', direction: int = ASCENDING,
+                       projection: Optional[dict] = None, view: Optional[Type[BaseModel]] = None) -> Page[_T]:
+        """
+        List one page of documents using keyset pagination.
+        Unlike `skip`, the cost of a page does not grow with its depth.
+
+        Args:
+            filter (dict, optional): Filter to apply to the documents. Defaults to {}.
+            limit (int, optional): Page size. Defaults to 50.
+            after (str, optional): The `next` token of the previous page. Defaults to None.
+            sort_key (str, optional): Indexed field to paginate on. Defaults to '_id'.
+            direction (int, optional): `ASCENDING` or `DESCENDING`. Defaults to ASCENDING.
+            projection (dict, optional): Fields to fetch, requires a `view`. Defaults to the whole document, or to the `view` fields.
+            view (Type[BaseModel], optional): A partial model to hydrate the documents with. Defaults to `self.model`.
+
+        Returns:
+            Page[_T]: The documents, and the token of the next page if there is one.
+
+        Raises:
+            InvalidPageToken: If the `after` token is invalid, a `ValueError` and a 400 `HTTPException`.
+        """
+        query = keyset_query(filter, sort_key, direction, after)
+        projection, model = resolve_view(self.model, projection, view)
+        try:
+            await self._check_plan(query, keyset_sort(sort_key, direction), limit + 1)
+            cursor = self.collection.find(query, keyset_projection(projection, sort_key)).sort(keyset_sort(sort_key, direction)).limit(limit + 1)
+            documents = await cursor.to_list(length=limit + 1)
+            return build_page(documents, limit, sort_key, lambda documents: self._hydrate_many(documents, model))
+        except PyMongoError as e:
+            self.logger.error("Failed to retrieve documents: %s", e)
+            return Page(items=[])
+
+    async def iter_batches(self, filter: dict = {}, batch_size: int = 100, projection: Optional[dict] = None,
+                           view: Optional[Type[BaseModel]] = None) -> AsyncIterator[List[_T]]:
+        """
+        Iterate over the documents in the collection, one batch at a time.
+        Only one batch is held in memory, unlike `list`, which loads the whole result set.
+
+        Args:
+            filter (dict, optional): Filter to apply to the documents. Defaults to {}.
+            batch_size (int, optional): Number of documents fetched per round trip. Defaults to 100.
+            projection (dict, optional): Fields to fetch, requires a `view`. Defaults to the whole document, or to the `view` fields.
+            view (Type[BaseModel], optional): A partial model to hydrate the documents with. Defaults to `self.model`.
+
+        Yields:
+            List[_T]: The hydrated documents of each batch.
+
+        Raises:
+            PyMongoError: If the cursor fails. Batches may already be sent, so a streamed
+                response is aborted rather than ended as if it was complete.
+        """
+        try:
+            projection, model = resolve_view(self.model, projection, view)
+            await self._check_plan(filter)
+            cursor = self.collection.find(filter, projection).batch_size(batch_size)
+            while True:
+                documents = await cursor.to_list(length=batch_size)
+                if not documents:
+                    break
+                yield self._hydrate_many(documents, model)
+        except PyMongoError as e:
+            self.logger.error("Failed to retrieve documents: %s", e)
+            raise
+
+    async def stream(self, filter: dict = {}, batch_size: int = 100, projection: Optional[dict] = None,
+                     view: Optional[Type[BaseModel]] = None) -> AsyncIterator[_T]:
+        """
+        Stream the documents in the collection, one model at a time.
+
+        Args:
+            filter (dict, optional): Filter to apply to the documents. Defaults to {}.
+            batch_size (int, optional): Number of documents fetched per round trip. Defaults to 100.
+            projection (dict, optional): Fields to fetch, requires a `view`. Defaults to the whole document, or to the `view` fields.
+            view (Type[BaseModel], optional): A partial model to hydrate the documents with. Defaults to `self.model`.
+
+        Yields:
+            _T: The hydrated documents matching the filter.
+
+        Raises:
+            PyMongoError: If the cursor fails, see `iter_batches`.
+        """
+        async for batch in self.iter_batches(filter, batch_size=batch_size, projection=projection, view=view):
+            for model in batch:
+                yield model
+
     async def insert_many(self, data: List[dict]) -> bool:
         """
         Insert many documents in the collection.
@@ -315,5 +664,179 @@ class AsyncBaseRepository(AbstractRepository, Generic[_T]):
             result = await self.collection.insert_many(data)
             return len(result.inserted_ids) == len(data)
         except PyMongoError as e:
-            self.logger.error(f"Failed to insert documents: {e}")
+            self.logger.error("Failed to insert documents: %s", e)
             return False
+
+    async def bulk_write(self, operations: Iterable[BulkOperation], ordered: bool = True,
+                         chunk_size: Optional[int] = None) -> BulkWriteReport:
+        """
+        Apply mixed insert/update/upsert/delete operations in as few round trips as possible.
+        The operations are sent in chunks of the server `maxWriteBatchSize`.
+
+        Args:
+            operations (Iterable[BulkOperation]): PyMongo write operations, see also `fastcore.bulk.update`/`upsert`.
+            ordered (bool, optional): Stop at the first error. Unordered writes let the server apply
+                the operations in parallel and keep going past errors. Defaults to True.
+            chunk_size (int, optional): Maximum operations per round trip. Defaults to the server limit.
+
+        Returns:
+            BulkWriteReport: The aggregated counts, upserted ids and per-operation errors.
+        """
+        report = BulkWriteReport()
+        offset = 0
+        for chunk in chunked(operations, chunk_size or max_write_batch_size(self.client)):
+            try:
+                report.add_result(await self.collection.bulk_write(chunk, ordered=ordered), offset)
+            except BulkWriteError as e:
+                report.add_details(e.details, offset)
+                if ordered:
+                    break
+            except PyMongoError as e:
+                self.logger.error("Failed to bulk write documents: %s", e)
+                report.add_failure(offset, e)
+                break
+            offset += len(chunk)
+        return report
+
+
+def _with_key(projection: Optional[dict], key: str) -> Optional[dict]:
+    """
+    Makes sure the projection fetches the key the documents are matched back with.
+    """
+    if projection is None:
+        return None
+    projection = dict(projection)
+    inclusion = any(value for name, value in projection.items() if name != '_id') or projection == {'_id': 1}
+    if inclusion or key == '_id':
+        projection[key] = 1
+    else:
+        projection.pop(key, None)
+    return projection
+
+
+_CLAUSE_OPERATORS = ('$and', '$or', '$nor')
+
+
+def _normalize_query(query: dict) -> dict:
+    """
+    Orders the fields and operators of a query, which MongoDB matches regardless of their order.
+    Embedded documents compared by equality are left as they are, their field order matters.
+    """
+    return {key: _normalize_condition(key, query[key]) for key in sorted(query)}
+
+
+def _normalize_condition(key: str, value: Any) -> Any:
+    if key in _CLAUSE_OPERATORS and isinstance(value, list):
+        return [_normalize_query(clause) if isinstance(clause, dict) else clause for clause in value]
+    if isinstance(value, dict) and value and all(name.startswith('$') for name in value):
+        return {name: _normalize_operator(name, value[name]) for name in sorted(value)}
+    return value
+
+
+def _normalize_operator(name: str, value: Any) -> Any:
+    if name == '$elemMatch' and isinstance(value, dict):
+        return _normalize_query(value)
+    if name == '$not':
+        return _normalize_condition(name, value)
+    return value
+
+
+def _cache_key(operation: str, query: dict, projection: Optional[dict], view: Optional[Type[BaseModel]]) -> tuple:
+    """
+    A normalized cache key, queries are encoded as canonical extended JSON so BSON types are kept apart,
+    after ordering their fields and operators, so equivalent queries share an entry.
+    """
+    return (
+        operation,
+        json_util.dumps(_normalize_query(query), json_options=CANONICAL_JSON_OPTIONS),
+        json_util.dumps(dict(sorted(projection.items())), json_options=CANONICAL_JSON_OPTIONS) if projection is not None else None,
+        f'{view.__module__}.{view.__qualname__}' if view is not None else None,
+    )
+
+
+class CachedAsyncRepository(AsyncBaseRepository, Generic[_T]):
+    """
+    An asynchronous repository with a read-through cache on `read` and `list`.
+    Writes made through the repository invalidate the cached entries of its collection.
+    The cached models are shared between callers, and must be treated as read-only.
+    """
+
+    def __init__(self, client: CLIENTS, database_name: str, collection_name: str, model: _T,
+                 cache: Optional[CacheBackend] = None, ttl: Optional[float] = None):
+        """
+        Initialize the repository.
+
+        Args:
+            client (CLIENTS): MongoDB client instance.
+            database_name (str): Name of the database.
+            collection_name (str): Name of the collection.
+            model (_T): Model used to hydrate the documents.
+            cache (CacheBackend, optional): The cache, share it between instances. Defaults to a new in-process cache.
+            ttl (float, optional): Time to live of the entries, in seconds. Defaults to the backend one.
+        """
+        super().__init__(client, database_name, collection_name, model)
+        self.cache = cache if cache is not None else MemoryCacheBackend()
+        self.ttl = ttl
+        self.namespace = f'{database_name}.{collection_name}'
+
+    # NOTE The loaders raise, so a database error is never cached as a miss or an empty list
+    async def read(self, query: dict, projection: Optional[dict] = None, view: Optional[Type[BaseModel]] = None) -> Optional[_T]:
+        try:
+            return await self.cache.get_or_load(
+                self.namespace,
+                _cache_key('read', query, projection, view),
+                lambda: self._find_one(query, projection, view),
+                self.ttl,
+            )
+        except PyMongoError as e:
+            self.logger.error("Failed to find document: %s", e)
+            return None
+
+    async def list(self, filter: dict = {}, projection: Optional[dict] = None, view: Optional[Type[BaseModel]] = None) -> List[_T]:
+        try:
+            return await self.cache.get_or_load(
+                self.namespace,
+                _cache_key('list', filter, projection, view),
+                lambda: self._find(filter, projection, view),
+                self.ttl,
+            )
+        except PyMongoError as e:
+            self.logger.error("Failed to retrieve documents: %s", e)
+            return []
+
+    async def invalidate(self) -> None:
+        """
+        Invalidate the cached entries of the collection.
+        """
+        await self.cache.invalidate(self.namespace)
+
+    async def create(self, data: dict) -> Optional[str]:
+        try:
+            return await super().create(data)
+        finally:
+            await self.invalidate()
+
+    async def update(self, query: dict, data: dict) -> bool:
+        try:
+            return await super().update(query, data)
+        finally:
+            await self.invalidate()
+
+    async def delete(self, query: dict) -> bool:
+        try:
+            return await super().delete(query)
+        finally:
+            await self.invalidate()
+
+    async def insert_many(self, data: List[dict]) -> bool:
+        try:
+            return await super().insert_many(data)
+        finally:
+            await self.invalidate()
+
+    async def bulk_write(self, operations: Iterable[BulkOperation], ordered: bool = True,
+                         chunk_size: Optional[int] = None) -> BulkWriteReport:
+        try:
+            return await super().bulk_write(operations, ordered=ordered, chunk_size=chunk_size)
+        finally:
+            await self.invalidate()
@@ -1,6 +1,7 @@
-from typing import Any, Dict, Optional, Generic, TypeVar  # noqa
+from typing import Any, Callable, Coroutine, Dict, Optional, Generic, TypeVar  # noqa
 
-from fastapi import Request
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
 from pydantic import BaseModel
 from starlette.datastructures import State
 
@@ -47,13 +48,48 @@ class UserRequest(Request, Generic[_TApp]):
 
     @property
     def user(self) -> Optional[AbstractUser]:
-        """Convenient access to the current user from the state."""
-        return self.state.get_user()
+        """
+        Convenient access to the current user from the state.
+        With the `BaseInjectUserMiddleware`, the user is looked up lazily: `await request.get_user()` first,
+        or depend on `get_request_user`. Reading it before raises a `RuntimeError`.
+        Handlers only receive a `UserRequest` through the `UserRoute`.
+        """
+        lazy_user = getattr(self.state, 'lazy_user', None)
+        if lazy_user is not None and not lazy_user.resolved:
+            raise RuntimeError('The user is not resolved yet, use `await request.get_user()`')
+        return getattr(self.state, 'user', None)
+
+    async def get_user(self) -> Optional[AbstractUser]:
+        """Get the current user, looking it up on first use with the `BaseInjectUserMiddleware`."""
+        lazy_user = getattr(self.state, 'lazy_user', None)
+        if lazy_user is not None:
+            return await lazy_user
+        return getattr(self.state, 'user', None)
 
     def set_user(self, user: AbstractUser) -> None:
         """Set the current user into the state."""
-        self.state.set_user(user)
+        self.state.user = user
+        self.state._state.pop('lazy_user', None)
 
     def clear_user(self) -> None:
         """Clear the current user from the state."""
-        self.state.clear_user()
+        self.state._state.pop('user', None)
+        self.state._state.pop('lazy_user', None)
+
+
+class UserRoute(APIRoute):
+    """
+    A route passing a `UserRequest` to its handler and dependencies, instead of a plain `Request`.
+    The default of `CustomClientApp` and `AbstractRouter`, set it as the `route_class` of other routers.
+
+    Usage:
+        router = APIRouter(route_class=UserRoute)
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def user_route_handler(request: Request) -> Response:
+            return await handler(UserRequest(request.scope, request.receive, request._send))
+
+        return user_route_handler
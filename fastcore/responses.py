@@ -0,0 +1,96 @@
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Union
+
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel
+
+from .serialization import dumps, raw_to_json
+
+_Chunk = Union[BaseModel, Iterable[BaseModel]]
+
+
+async def _batches(content: AsyncIterable[_Chunk]) -> AsyncIterator[Iterable[BaseModel]]:
+    """
+    Normalizes the content to batches of models.
+    Accepts both `AsyncBaseRepository.stream` and `AsyncBaseRepository.iter_batches` outputs.
+    """
+    async for chunk in content:
+        if isinstance(chunk, BaseModel):
+            yield (chunk,)
+        else:
+            yield chunk
+
+
+async def _ndjson(content: AsyncIterable[_Chunk]) -> AsyncIterator[bytes]:
+    async for batch in _batches(content):
+        lines = [model.model_dump_json(by_alias=True) + '\n' for model in batch]
+        if lines:
+            yield ''.join(lines).encode('utf-8')
+
+
+async def _json_array(content: AsyncIterable[_Chunk]) -> AsyncIterator[bytes]:
+    first = True
+    yield b'['
+    async for batch in _batches(content):
+        items = [model.model_dump_json(by_alias=True) for model in batch]
+        if not items:
+            continue
+        body = ','.join(items)
+        yield (body if first else ',' + body).encode('utf-8')
+        first = False
+    yield b']'
+
+
+def ndjson_response(content: AsyncIterable[_Chunk], **kwargs) -> StreamingResponse:
+    """
+    Streams the models as newline delimited JSON, one write per batch.
+
+    Args:
+        content (AsyncIterable): Models or batches of models, e.g. `repository.iter_batches(...)`.
+
+    Returns:
+        StreamingResponse: The `application/x-ndjson` response.
+    """
+    return StreamingResponse(_ndjson(content), media_type='application/x-ndjson', **kwargs)
+
+
+def json_array_response(content: AsyncIterable[_Chunk], **kwargs) -> StreamingResponse:
+    """
+    Streams the models as a single JSON array, one write per batch.
+    If the content fails midway, e.g. on a cursor error, the response is aborted without its closing `]`,
+    so clients see an incomplete body instead of a truncated, valid array.
+
+    Args:
+        content (AsyncIterable): Models or batches of models, e.g. `repository.iter_batches(...)`.
+
+    Returns:
+        StreamingResponse: The `application/json` response.
+    """
+    return StreamingResponse(_json_array(content), media_type='application/json', **kwargs)
+
+
+class RawBSONResponse(Response):
+    """
+    A JSON response for raw BSON documents, e.g. from `repository.list_raw`.
+    The documents are decoded when rendered, see `fastcore.serialization.raw_to_json`.
+
+    Usage:
+        @router.get('/items', response_class=RawBSONResponse)
+        async def items():
+            return RawBSONResponse(await repository.list_raw())
+    """
+    media_type = 'application/json'
+
+    def render(self, content: Any) -> bytes:
+        return raw_to_json(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    A JSON response rendered with orjson, natively handling `ObjectId`, datetimes, URLs and enums.
+    Enable it app wide with `CustomClientApp(fast_json_response=True)`, which also registers
+    the BSON types with `jsonable_encoder`, still run by FastAPI on the returned content.
+    Return it directly from hot routes to also skip `jsonable_encoder`.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
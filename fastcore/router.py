@@ -3,6 +3,7 @@ from fastapi import APIRouter
 from dotenv import load_dotenv
 
 from fastcore.client_handler import get_settings
+from fastcore.request import UserRoute
 from .logger import setup_logger
 
 
@@ -10,6 +11,8 @@ class AbstractRouter(APIRouter):
     client_debug: bool = None
 
     def __init__(self, *args, **kwargs):
+        # NOTE Handlers receive a `UserRequest`, e.g. for `await request.get_user()`
+        kwargs.setdefault('route_class', UserRoute)
         super().__init__(*args, **kwargs)
         self.logger = setup_logger(self._type())
 
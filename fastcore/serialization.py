@@ -0,0 +1,75 @@
+import base64
+from decimal import Decimal
+from typing import Any
+
+import bson
+import orjson
+import pydantic_core
+from bson import Binary, Decimal128, ObjectId
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from fastapi.encoders import ENCODERS_BY_TYPE
+from pydantic import AnyUrl, BaseModel
+
+# Codec options to fetch documents as undecoded BSON
+RAW_CODEC_OPTIONS = CodecOptions(document_class=RawBSONDocument)
+
+
+def default(obj: Any) -> Any:
+    """
+    Serializes the types orjson does not handle natively.
+    `ObjectId` is serialized as a string, as in `HasId.serialize_object_id`.
+    Datetimes, enums such as `LinkCategory`, UUIDs and dataclasses are handled by orjson itself.
+    """
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode='json', by_alias=True)
+    if isinstance(obj, (AnyUrl, pydantic_core.Url)):
+        return str(obj)
+    if isinstance(obj, RawBSONDocument):
+        return bson.decode(obj.raw)
+    if isinstance(obj, Decimal128):
+        return str(obj)
+    if isinstance(obj, (Binary, bytes)):
+        return base64.b64encode(obj).decode('ascii')
+    if isinstance(obj, Decimal):
+        # As `jsonable_encoder` does
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def register_bson_encoders() -> None:
+    """
+    Lets `jsonable_encoder`, run by FastAPI on what routes return without a `response_model`,
+    serialize `ObjectId` and `Decimal128` as strings, as `default` does.
+    The encoders are process wide, as FastAPI's own.
+    """
+    ENCODERS_BY_TYPE[ObjectId] = str
+    ENCODERS_BY_TYPE[Decimal128] = str
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serializes the content to JSON bytes, with orjson.
+    """
+    return orjson.dumps(content, default=default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+
+
+def raw_to_json(content: Any) -> bytes:
+    """
+    Serializes raw BSON documents, or lists of them, to JSON bytes.
+    There is no BSON to JSON encoder in C, so the documents are still decoded to dicts,
+    a list of them in a single `bson.decode_all` call, before orjson encodes them.
+    The decoding costs what the driver would have spent on the documents. The gain is skipping
+    the pydantic models and `jsonable_encoder`, as returning `FastJSONResponse(documents)` does.
+    """
+    if isinstance(content, RawBSONDocument):
+        return dumps(bson.decode(content.raw))
+    if isinstance(content, (list, tuple)) and all(isinstance(document, RawBSONDocument) for document in content):
+        return dumps(bson.decode_all(b''.join(document.raw for document in content)))
+    if isinstance(content, (list, tuple)):
+        return dumps([bson.decode(document.raw) if isinstance(document, RawBSONDocument) else document for document in content])
+    return dumps(content)
@@ -0,0 +1,24 @@
+import sys
+from typing import Optional
+
+from gunicorn.app.wsgiapp import WSGIApplication
+
+
+def main(app: Optional[str] = None) -> None:
+    """
+    Runs an app with gunicorn and the `fastcore.gunicorn_conf` settings.
+    Extra command line arguments are passed to gunicorn, and override the settings.
+
+    Usage:
+        python -m fastcore.serve app.main:app --bind 0.0.0.0:80
+
+    Args:
+        app (str, optional): The app, as `module:attribute`. Defaults to the first argument.
+    """
+    args = sys.argv[1:] if app is None else [app, *sys.argv[1:]]
+    sys.argv = [sys.argv[0], '-c', 'python:fastcore.gunicorn_conf', *args]
+    WSGIApplication('%(prog)s [OPTIONS] [APP_MODULE]').run()
+
+
+if __name__ == '__main__':
+    main()
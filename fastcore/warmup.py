@@ -0,0 +1,63 @@
+import asyncio
+import time
+from typing import Optional
+
+from pymongo.errors import OperationFailure
+
+from .indexes import IndexRegistry, index_registry
+from .logger import setup_logger
+from .types import CLIENTS
+
+logger = setup_logger('Warmup')
+
+
+async def open_connections(client: CLIENTS, count: Optional[int] = None) -> int:
+    """
+    Opens `count` pool connections at once with concurrent pings, so the first requests
+    do not pay the TCP, TLS and auth handshakes.
+
+    Args:
+        client (CLIENTS): The client.
+        count (int, optional): The connections to open. Defaults to the `minPoolSize` of the client.
+
+    Returns:
+        int: The connections opened.
+    """
+    count = count if count is not None else client.options.pool_options.min_pool_size
+    # NOTE Concurrent commands each check out their own connection
+    await asyncio.gather(*(client.admin.command('ping') for _ in range(max(count, 1))))
+    return max(count, 1)
+
+
+async def touch_collections(client: CLIENTS, registry: IndexRegistry = index_registry) -> None:
+    """
+    Reads one document through every registered index, to load their first pages in the cache.
+    An index that can not be hinted, yet to be built or partial, is skipped.
+    """
+    for (database_name, collection_name), specs in registry.items():
+        collection = client[database_name][collection_name]
+        await collection.find_one({}, projection={'_id': 1})
+        for spec in specs:
+            try:
+                await collection.find_one({}, projection={'_id': 1}, hint=spec.index_name)
+            except OperationFailure as e:
+                logger.debug('Skipped index %s on %s.%s: %s', spec.index_name, database_name, collection_name, e)
+
+
+async def warm_up(client: CLIENTS, connections: Optional[int] = None, registry: IndexRegistry = index_registry) -> None:
+    """
+    Checks the database is reachable, opens the pool and touches the registered collections.
+    Any error is raised, so a bad configuration fails the startup instead of the first requests.
+
+    Args:
+        client (CLIENTS): The client.
+        connections (int, optional): The connections to open. Defaults to the `minPoolSize` of the client.
+        registry (IndexRegistry, optional): The collections to touch. Defaults to `index_registry`.
+    """
+    started = time.perf_counter()
+    # NOTE Fails within `serverSelectionTimeoutMS` on a wrong host or credentials
+    await client.admin.command('ping')
+    opened = await open_connections(client, connections)
+    await touch_collections(client, registry)
+    logger.info('Warmed up %s connections and %s collections in %.0fms',
+                opened, len(registry.collections()), 1000 * (time.perf_counter() - started))
@@ -0,0 +1,159 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from pymongo.errors import OperationFailure
+
+from fastcore.auth.user_cache import UserCache, watch_users
+from fastcore.cache import MISSING, MemoryCacheBackend
+from fastcore.change_streams import (
+    CHANGE_STREAM_HISTORY_LOST,
+    CHANGE_STREAMS_UNSUPPORTED,
+    ChangeStreamInvalidator,
+    MemoryResumeTokenStore,
+)
+
+NAMESPACE = 'db.items'
+
+
+class FakeClient:
+
+    def __getitem__(self, name):
+        return {'items': f'{name}.items'}
+
+
+class FakeChangeStreams:
+    """
+    A fake change stream source: events are pushed to a queue, and every opened stream is recorded.
+    """
+
+    def __init__(self, errors=()):
+        self.events = asyncio.Queue()
+        self.errors = list(errors)
+        self.opened = []
+
+    def push(self, token, operation='update'):
+        self.events.put_nowait({'_id': token, 'operationType': operation})
+
+    @asynccontextmanager
+    async def watch(self, collection, resume_after):
+        self.opened.append(resume_after)
+        if self.errors:
+            raise self.errors.pop(0)
+        yield self._stream()
+
+    async def _stream(self):
+        while True:
+            yield await self.events.get()
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def _invalidator(source, store=None):
+    invalidator = ChangeStreamInvalidator(token_store=store or MemoryResumeTokenStore(), watch=source.watch,
+                                          checkpoint_interval=0, retry_delay=0)
+    cache = MemoryCacheBackend()
+    invalidator.register('db', 'items', cache)
+    return invalidator, cache
+
+
+def test_events_invalidate_the_registered_caches():
+    async def run():
+        source = FakeChangeStreams()
+        invalidator, cache = _invalidator(source)
+        invalidator.start(FakeClient())
+        await _settle()
+        # Opening the stream invalidates, changes may have been missed while it was closed
+        opened = await cache.version(NAMESPACE)
+        source.push({'token': 1})
+        source.push({'token': 2})
+        await _settle()
+        assert await cache.version(NAMESPACE) == opened + 2
+        await invalidator.stop()
+
+    asyncio.run(run())
+
+
+def test_resume_token_is_saved_and_resumed_after():
+    async def run():
+        store = MemoryResumeTokenStore()
+        source = FakeChangeStreams()
+        invalidator, _ = _invalidator(source, store)
+        invalidator.start(FakeClient())
+        await _settle()
+        source.push({'token': 7})
+        await _settle()
+        await invalidator.stop()
+        assert store.tokens[NAMESPACE] == {'token': 7}
+
+        restarted, _ = _invalidator(source, store)
+        restarted.start(FakeClient())
+        await _settle()
+        assert source.opened[-1] == {'token': 7}
+        await restarted.stop()
+
+    asyncio.run(run())
+
+
+def test_invalidate_event_is_not_resumed_after():
+    async def run():
+        store = MemoryResumeTokenStore()
+        source = FakeChangeStreams()
+        invalidator, _ = _invalidator(source, store)
+        invalidator.start(FakeClient())
+        await _settle()
+        source.push({'token': 3}, operation='invalidate')
+        await _settle()
+        await invalidator.stop()
+        assert store.tokens[NAMESPACE] is None
+
+    asyncio.run(run())
+
+
+def test_lost_history_restarts_without_token():
+    async def run():
+        store = MemoryResumeTokenStore()
+        store.tokens[NAMESPACE] = {'token': 'old'}
+        source = FakeChangeStreams(errors=[OperationFailure('lost', code=CHANGE_STREAM_HISTORY_LOST)])
+        invalidator, _ = _invalidator(source, store)
+        invalidator.start(FakeClient())
+        await _settle()
+        assert source.opened == [{'token': 'old'}, None]
+        await invalidator.stop()
+
+    asyncio.run(run())
+
+
+def test_unsupported_server_stops_watching():
+    async def run():
+        source = FakeChangeStreams(errors=[OperationFailure('unsupported', code=CHANGE_STREAMS_UNSUPPORTED)])
+        invalidator, _ = _invalidator(source)
+        invalidator.start(FakeClient())
+        await _settle()
+        assert source.opened == [None]
+        assert all(task.done() for task in invalidator._tasks)
+        await invalidator.stop()
+
+    asyncio.run(run())
+
+
+def test_user_writes_clear_the_user_cache():
+    async def run():
+        source = FakeChangeStreams()
+        invalidator = ChangeStreamInvalidator(token_store=MemoryResumeTokenStore(), watch=source.watch,
+                                              checkpoint_interval=0, retry_delay=0)
+        cache = UserCache()
+        watch_users(invalidator, cache)
+        watch_users(invalidator, cache)
+        invalidator.start({'users': {'users': 'users.users'}})
+        await _settle()
+        cache.set('alice', {'username': 'alice'})
+        source.push({'token': 1})
+        await _settle()
+        assert cache.get('alice') is MISSING
+        assert len(invalidator._caches[('users', 'users')]) == 1
+        await invalidator.stop()
+
+    asyncio.run(run())
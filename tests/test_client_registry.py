@@ -0,0 +1,101 @@
+import json
+import os
+
+import pytest
+from pymongo.errors import PyMongoError
+
+from fastcore.client_handler import get_settings
+from fastcore.mongo_client import client_registry
+from fastcore.mongo_settings import MongoSettings
+
+requires_fork = pytest.mark.skipif(not hasattr(os, 'fork'), reason='Requires fork()')
+
+# NOTE Fails fast when no local MongoDB runs
+SETTINGS = MongoSettings(server_selection_timeout_ms=500)
+
+
+def _pool_ports(client) -> list:
+    """
+    The local ports of the pooled sockets of a sync client.
+    """
+    return sorted(conn.conn.getsockname()[1]
+                  for server in client._topology._servers.values()
+                  for conn in server.pool.conns)
+
+
+def _in_child(report) -> dict:
+    """
+    Runs `report` in a forked child, returning what it wrote as JSON.
+    """
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read)
+        try:
+            result = report()
+        except BaseException as e:
+            result = {'error': repr(e)}
+        with os.fdopen(write, 'w') as f:
+            json.dump(result, f)
+        os._exit(0)
+    os.close(write)
+    with os.fdopen(read) as f:
+        result = json.load(f)
+    os.waitpid(pid, 0)
+    return result
+
+
+@requires_fork
+def test_forked_child_creates_its_own_client():
+    parent = client_registry.get(debug=True, settings=SETTINGS, sync=True)
+    try:
+        assert client_registry.get(debug=True, settings=SETTINGS, sync=True) is parent
+
+        def report():
+            child = client_registry.get(debug=True, settings=SETTINGS, sync=True)
+            same = child is parent or child._topology is parent._topology
+            child.close()
+            return {'same': same}
+
+        assert _in_child(report) == {'same': False}
+        # The parent keeps its client
+        assert client_registry.get(debug=True, settings=SETTINGS, sync=True) is parent
+    finally:
+        client_registry.close_all()
+
+
+@requires_fork
+def test_forked_child_shares_no_pooled_socket():
+    parent = client_registry.get(debug=True, settings=SETTINGS, sync=True)
+    try:
+        try:
+            parent.admin.command('ping')
+        except PyMongoError:
+            pytest.skip('Requires a local MongoDB')
+        parent_ports = _pool_ports(parent)
+        assert parent_ports
+
+        def report():
+            child = client_registry.get(debug=True, settings=SETTINGS, sync=True)
+            child.admin.command('ping')
+            ports = _pool_ports(child)
+            child.close()
+            return {'ports': ports}
+
+        child_ports = _in_child(report)['ports']
+        assert child_ports
+        assert not set(child_ports) & set(parent_ports)
+    finally:
+        client_registry.close_all()
+
+
+def test_get_settings_follows_the_app_configuration():
+    app_client = object()
+    try:
+        # NOTE As `CustomClientApp.set_client(os.getenv('DEBUG'))` does in production
+        client_registry.set_default('false')
+        client_registry.register(app_client, debug='false')
+        assert get_settings().client is app_client
+    finally:
+        client_registry.set_default(True)
+        client_registry.reset()
@@ -0,0 +1,61 @@
+import asyncio
+
+from fastapi import Depends
+from fastapi.testclient import TestClient
+
+from benchmarks.fixtures import USERNAME, clear_auth_caches, make_client, make_token
+from fastcore.app import CustomClientApp
+from fastcore.middlewares.inject_user import BaseInjectUserMiddleware, get_request_user
+from fastcore.request import UserRequest
+from fastcore.router import AbstractRouter
+
+
+class Router(AbstractRouter):
+    client_debug = True
+
+
+def _client(cookies: dict = None) -> TestClient:
+    app = CustomClientApp()
+    app.client = asyncio.run(make_client(count=0))
+    app.add_middleware(BaseInjectUserMiddleware)
+
+    @app.get('/lazy')
+    async def lazy(request: UserRequest):
+        assert isinstance(request, UserRequest)
+        user = await request.get_user()
+        # Resolved, `request.user` is the model or None again
+        assert request.user is user
+        return {'username': user and user.username}
+
+    @app.get('/dependency')
+    async def dependency(user=Depends(get_request_user)):
+        return {'username': user and user.username}
+
+    router = Router()
+
+    @router.get('/routed')
+    async def routed(request: UserRequest):
+        try:
+            request.user
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError('An unresolved user must not be read')
+        user = await request.get_user()
+        return {'username': user and user.username}
+
+    app.include_router(router)
+    clear_auth_caches()
+    return TestClient(app, cookies=cookies)
+
+
+def test_handlers_resolve_the_user_from_the_request():
+    client = _client(cookies={'access_token': make_token()})
+    for path in ('/lazy', '/dependency', '/routed'):
+        assert client.get(path).json() == {'username': USERNAME}
+
+
+def test_anonymous_requests_resolve_to_none():
+    client = _client()
+    for path in ('/lazy', '/dependency', '/routed'):
+        assert client.get(path).json() == {'username': None}
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+from pymongo.errors import AutoReconnect
+
+from benchmarks.memory_mongo import MemoryClient
+from fastcore.loader import RepositoryLoader
+from fastcore.repository import AsyncBaseRepository
+from fastcore.schemas.base import HasId
+
+
+class Item(HasId):
+    name: str
+
+
+async def _loader():
+    client = MemoryClient()
+    ids = (await client['db']['items'].insert_many([{'name': 'a'}, {'name': 'b'}])).inserted_ids
+    return RepositoryLoader(AsyncBaseRepository(client, 'db', 'items', Item)), ids
+
+
+def test_batches_loads_and_resolves_missing_keys_to_none():
+    async def run():
+        loader, ids = await _loader()
+        first, second, missing = await asyncio.gather(loader.load(ids[0]), loader.load(ids[1]), loader.load('missing'))
+        assert (first.name, second.name, missing) == ('a', 'b', None)
+
+    asyncio.run(run())
+
+
+def test_database_errors_are_raised_and_not_kept():
+    async def run():
+        loader, ids = await _loader()
+        collection = loader.repository.collection
+        find = collection.find
+
+        def failing_find(*args, **kwargs):
+            raise AutoReconnect('connection lost')
+
+        collection.find = failing_find
+        with pytest.raises(AutoReconnect):
+            await asyncio.gather(loader.load(ids[0]), loader.load(ids[1]))
+        assert not loader._futures
+
+        collection.find = find
+        assert (await loader.load(ids[0])).name == 'a'
+
+    asyncio.run(run())
@@ -0,0 +1,46 @@
+import logging
+
+from pydantic import BaseModel
+
+from fastcore.repository import AsyncBaseRepository, BaseRepository
+
+INSTANCES = 5000
+
+
+class FakeClient:
+
+    def __getitem__(self, name):
+        return {'items': f'{name}.items'}
+
+
+class Item(BaseModel):
+    name: str
+
+
+def _handlers() -> int:
+    loggers = [logging.getLogger()] + [logger for logger in logging.Logger.manager.loggerDict.values()
+                                       if isinstance(logger, logging.Logger)]
+    return sum(len(logger.handlers) for logger in loggers)
+
+
+def test_handler_count_is_constant_across_repository_instantiations():
+    # NOTE Warm up, the first instances configure their logger names
+    AsyncBaseRepository(FakeClient(), 'db', 'items', Item)
+    BaseRepository(FakeClient(), 'db', 'items', Item)
+    handlers, loggers = _handlers(), len(logging.Logger.manager.loggerDict)
+    logging.disable(logging.INFO)
+    try:
+        for _ in range(INSTANCES):
+            AsyncBaseRepository(FakeClient(), 'db', 'items', Item)
+            BaseRepository(FakeClient(), 'db', 'items', Item)
+    finally:
+        logging.disable(logging.NOTSET)
+    assert _handlers() == handlers
+    assert len(logging.Logger.manager.loggerDict) == loggers
+
+
+def test_loggers_of_a_name_share_one_handler():
+    first = AsyncBaseRepository(FakeClient(), 'db', 'items', Item).logger
+    second = AsyncBaseRepository(FakeClient(), 'db', 'items', Item).logger
+    assert first is second
+    assert len(first.handlers) == 1
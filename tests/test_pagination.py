@@ -0,0 +1,95 @@
+import asyncio
+import base64
+from typing import Optional
+
+import pytest
+from bson import ObjectId, json_util
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from pymongo import ASCENDING, DESCENDING
+
+from benchmarks.memory_mongo import MemoryClient
+from fastcore.pagination import InvalidPageToken, PageParams, decode_token, encode_token
+from fastcore.repository import AsyncBaseRepository
+from fastcore.schemas.base import HasId
+
+# Null and missing scores sort first, as equal, in MongoDB
+SCORES = [None, 'missing', 1, 2, 2, None, 3, 'missing', 2]
+
+
+class Scored(HasId):
+    score: Optional[int] = None
+
+
+def _repository() -> tuple:
+    client = MemoryClient()
+    repository = AsyncBaseRepository(client, 'db', 'scores', Scored)
+    documents = []
+    for score in SCORES:
+        document = {'_id': ObjectId()}
+        if score != 'missing':
+            document['score'] = score
+        documents.append(document)
+    asyncio.run(client['db']['scores'].insert_many(documents))
+    return repository, documents
+
+
+def _expected(documents: list, direction: int) -> list:
+    def key(document):
+        score = document.get('score')
+        return (score is not None, score or 0, document['_id'])
+    return [document['_id'] for document in sorted(documents, key=key, reverse=direction == DESCENDING)]
+
+
+def _walk(repository: AsyncBaseRepository, direction: int, limit: int) -> list:
+    async def run():
+        ids, after = [], None
+        while True:
+            page = await repository.paginate({}, limit=limit, after=after, sort_key='score', direction=direction)
+            ids += [item.id for item in page.items]
+            if page.next is None:
+                return ids
+            after = page.next
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize('direction', [ASCENDING, DESCENDING])
+@pytest.mark.parametrize('limit', [1, 2, 4])
+def test_pages_cross_null_and_missing_sort_values(direction, limit):
+    repository, documents = _repository()
+    assert _walk(repository, direction, limit) == _expected(documents, direction)
+
+
+def _token(payload) -> str:
+    return base64.urlsafe_b64encode(json_util.dumps(payload).encode()).decode().rstrip('=')
+
+
+@pytest.mark.parametrize('token', [
+    'garbage!!',
+    _token(['not', 'a', 'dict']),
+    _token({'k': 'other', 'v': [1, ObjectId()]}),
+    _token({'k': 'score', 'v': {'$gt': ''}}),
+    _token({'k': 'score', 'v': [1]}),
+])
+def test_malformed_tokens_are_rejected(token):
+    with pytest.raises(InvalidPageToken):
+        decode_token('score', token)
+
+
+def test_tokens_round_trip():
+    _id = ObjectId()
+    assert decode_token('score', encode_token('score', {'_id': _id})) == [None, _id]
+
+
+def test_malformed_token_answers_a_400():
+    repository, _ = _repository()
+    app = FastAPI()
+
+    @app.get('/scores')
+    async def scores(page: PageParams = Depends()):
+        await repository.paginate(limit=page.limit, after=page.after)
+        return {}
+
+    response = TestClient(app).get('/scores', params={'after': 'garbage!!'})
+    assert response.status_code == 400
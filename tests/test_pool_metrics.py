@@ -0,0 +1,38 @@
+import asyncio
+from types import SimpleNamespace
+
+from fastcore.health import HealthMonitor
+from fastcore.mongo_client import get_async_mongo_client, get_sync_mongo_client
+from fastcore.mongo_settings import MongoSettings
+from fastcore.monitoring import pool_metrics_of
+
+ADDRESS = ('localhost', 27017)
+
+
+def _checked_out(metrics, count: int, max_pool_size: int) -> None:
+    metrics.pool_created(SimpleNamespace(address=ADDRESS, options={'maxPoolSize': max_pool_size}))
+    for _ in range(count):
+        metrics.connection_checked_out(SimpleNamespace(address=ADDRESS, duration=0.0))
+
+
+def test_clients_of_one_server_keep_their_own_metrics():
+    async def run():
+        sync_client = get_sync_mongo_client(debug=True, settings=MongoSettings(max_pool_size=10))
+        async_client = get_async_mongo_client(debug=True, settings=MongoSettings(max_pool_size=100))
+        try:
+            sync_metrics, async_metrics = pool_metrics_of(sync_client), pool_metrics_of(async_client)
+            assert sync_metrics is not None and async_metrics is not None
+            assert sync_metrics is not async_metrics
+            _checked_out(sync_metrics, 5, 10)
+            _checked_out(async_metrics, 1, 100)
+            assert sync_metrics.saturation() == 0.5
+            assert async_metrics.saturation() == 0.01
+            monitor = HealthMonitor()
+            monitor.start(async_client)
+            assert monitor.metrics is async_metrics
+            await monitor.stop()
+        finally:
+            sync_client.close()
+            async_client.close()
+
+    asyncio.run(run())